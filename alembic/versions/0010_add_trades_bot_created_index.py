@@ -0,0 +1,21 @@
+"""add (trading_bot_id, created_at) index on trades
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-14
+"""
+
+from alembic import op
+
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_trades_bot_created", "trades", ["trading_bot_id", "created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_trades_bot_created", "trades")
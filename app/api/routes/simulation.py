@@ -1,8 +1,12 @@
 """Simulation and screening API endpoints."""
 
 import time
-import json
 import logging
+import multiprocessing
+import threading
+import orjson
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
@@ -26,6 +30,30 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/simulation", tags=["simulation"])
 
+_optimizer_pool: ProcessPoolExecutor | None = None
+_optimizer_pool_lock = threading.Lock()
+
+
+def _get_optimizer_pool() -> ProcessPoolExecutor:
+    """Process pool shared by optimization requests, created on first use.
+
+    Workers are spawned rather than forked since the API process runs threads.
+    """
+    global _optimizer_pool
+    with _optimizer_pool_lock:
+        if _optimizer_pool is None:
+            _optimizer_pool = ProcessPoolExecutor(mp_context=multiprocessing.get_context("spawn"))
+        return _optimizer_pool
+
+
+def _reset_optimizer_pool():
+    """Drop a broken pool (a worker died) so the next request starts a fresh one."""
+    global _optimizer_pool
+    with _optimizer_pool_lock:
+        if _optimizer_pool is not None:
+            _optimizer_pool.shutdown(wait=False, cancel_futures=True)
+            _optimizer_pool = None
+
 
 def _to_metrics(r: BacktestResult) -> BacktestMetrics:
     return BacktestMetrics(
@@ -77,7 +105,7 @@ def simulate_bot(
     if len(klines) < 100:
         raise HTTPException(status_code=400, detail=f"Insufficient historical data ({len(klines)} candles)")
 
-    close_prices = [k["close"] for k in klines]
+    close_prices = klines.close.tolist()
 
     try:
         result = optimize_parameters(
@@ -87,9 +115,14 @@ def simulate_bot(
             train_ratio=payload.train_ratio,
             grid_levels_options=payload.grid_levels_options,
             sell_percentage_options=payload.sell_percentage_options,
+            executor=_get_optimizer_pool(),
         )
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except BrokenProcessPool:
+        logger.error("Optimizer worker process died, restarting the pool")
+        _reset_optimizer_pool()
+        raise HTTPException(status_code=503, detail="Optimizer restarting, please retry")
 
     elapsed = int(time.time() * 1000) - start_ms
 
@@ -134,10 +167,16 @@ def get_screening_status(
     db: Session = Depends(get_db),
     user=Depends(get_current_user),
 ):
-    """Poll screening task progress and results."""
+    """Poll screening task progress and results.
+
+    While running, processed_symbols is the live count and can be ahead of
+    results, which are refreshed every RESULTS_FLUSH_EVERY symbols. Once
+    completed, both cover every symbol.
+    """
     cache = RedisCache()
     key = f"screening:{task_id}"
-    data = cache.client.get(key)
+    # The results blob is rewritten every few symbols; the live count is bumped per symbol
+    data, processed = cache.client.mget(key, f"{key}:processed")
 
     if not data:
         from app.workers.celery_app import celery
@@ -153,4 +192,10 @@ def get_screening_status(
             )
         raise HTTPException(status_code=404, detail="Screening task not found")
 
-    return ScreeningStatusResponse(**json.loads(data))
+    progress_data = orjson.loads(data)
+    if progress_data["status"] == "running" and processed is not None:
+        total = progress_data["total_symbols"]
+        progress_data["processed_symbols"] = int(processed)
+        progress_data["progress"] = int(int(processed) / total * 100) if total > 0 else 0
+
+    return ScreeningStatusResponse(**progress_data)
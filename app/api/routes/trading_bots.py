@@ -8,10 +8,13 @@ from sqlalchemy.orm import Session
 from app.core.db import get_db
 from app.core.config import settings
 from app.api.deps import get_current_user
-from app.schemas.trading_bot import TradingBotCreate, TradingBotUpdate, TradingBotRead, BotStats
+from app.schemas.trading_bot import (
+    TradingBotCreate, TradingBotUpdate, TradingBotRead, BotStats,
+    TradingBotReactivate, TradingBotReactivateResult,
+)
 from app.schemas.trade import TradeRead, TradeWithSymbol
 from app.services.trading_bot_service import TradingBotService
-from app.services.binance_trade_service import BinanceTradeService
+from app.services.binance_trade_service import get_trade_service
 from app.repositories.trading_bot_repo import TradingBotRepository
 from app.repositories.trade_repo import TradeRepository
 from app.core.cache import RedisCache
@@ -64,9 +67,8 @@ def bot_stats(db: Session = Depends(get_db), user=Depends(get_current_user)):
 
     results = []
     for bot in bots:
-        trades = trade_repo.list_by_bot(bot.id)
-        # Sort chronologically (oldest first) for FIFO matching
-        trades.sort(key=lambda t: t.created_at)
+        # Chronological (oldest first) for FIFO matching
+        trades = trade_repo.list_by_bot_chronological(bot.id)
 
         buys = []
         realized_profit = 0.0
@@ -153,6 +155,20 @@ def deactivate_bot(
     return bot
 
 
+@router.post("/reactivate", response_model=TradingBotReactivateResult)
+def reactivate_bots(
+    payload: TradingBotReactivate,
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    """Reactivate several of the user's inactive bots at once.
+
+    Ids of bots that are already active or belong to someone else are ignored.
+    """
+    reactivated = TradingBotService(db).bulk_reactivate(user.id, payload.bot_ids)
+    return TradingBotReactivateResult(reactivated=reactivated)
+
+
 @router.delete("/{bot_id}")
 def delete_bot(
     bot_id: int, db: Session = Depends(get_db), user=Depends(get_current_user)
@@ -196,8 +212,7 @@ def emergency_sell(
 
     # Compute open positions via FIFO matching
     trade_repo = TradeRepository(db)
-    trades = trade_repo.list_by_bot(bot_id)
-    trades.sort(key=lambda t: t.created_at)
+    trades = trade_repo.list_by_bot_chronological(bot_id)
 
     buys: list = []
     for t in trades:
@@ -221,10 +236,9 @@ def emergency_sell(
 
     # Place real Binance orders if live trading is enabled
     if settings.BINANCE_LIVE_TRADING and user.binance_api_key and user.binance_api_secret:
-        binance = BinanceTradeService(user.binance_api_key, user.binance_api_secret)
         total_qty = sum(b.quantity for b in buys)
         try:
-            binance.place_order(bot.symbol, "SELL", total_qty)
+            get_trade_service(user).place_order(bot.symbol, "SELL", total_qty)
         except Exception as e:
             logger.error(f"Emergency sell Binance order failed for bot {bot_id}: {e}")
             raise HTTPException(status_code=502, detail=f"Binance order failed: {e}")
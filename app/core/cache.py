@@ -1,20 +1,65 @@
 import redis
-import json
+import orjson
+import secrets
 import time
 from typing import Optional
 from app.core.config import settings
 
+# Published by the API when the set of active bot symbols may have changed
+SYMBOLS_CHANGED_CHANNEL = "bots:symbols_changed"
+
+
+# Deletes the lock only if it still holds our token, so a tick that outlived its
+# TTL can't release the lock a later tick has since taken
+_RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+# Token bucket shared by every worker: refills ARGV[2] tokens per second up to
+# ARGV[1]. Takes a token and returns "0", or returns the seconds to wait for one.
+_TAKE_TOKEN_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local tokens = tonumber(redis.call("hget", KEYS[1], "tokens"))
+local ts = tonumber(redis.call("hget", KEYS[1], "ts"))
+if tokens == nil or ts == nil then
+    tokens = capacity
+    ts = now
+end
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call("hset", KEYS[1], "tokens", tostring(tokens), "ts", tostring(now))
+redis.call("expire", KEYS[1], math.ceil(capacity / rate) + 1)
+return tostring(wait)
+"""
+
+# One client (and connection pool) per process, shared by every RedisCache;
+# redis-py resets the pool in a forked child, so prefork workers are safe
+_client: redis.Redis | None = None
+
 
 class RedisCache:
     """Redis client for caching cryptocurrency prices"""
 
     def __init__(self):
-        self.client = redis.from_url(
-            settings.REDIS_URL,
-            decode_responses=True,
-            socket_connect_timeout=2,
-            socket_timeout=2
-        )
+        global _client
+        if _client is None:
+            _client = redis.from_url(
+                settings.REDIS_URL,
+                decode_responses=True,
+                socket_connect_timeout=2,
+                socket_timeout=2
+            )
+        self.client = _client
 
     def set_price(self, symbol: str, price: float, ttl: int = 5) -> None:
         """Store a single price in cache with TTL
@@ -30,7 +75,7 @@ class RedisCache:
             "timestamp": time.time(),
             "source": "binance"
         }
-        self.client.setex(key, ttl, json.dumps(data))
+        self.client.setex(key, ttl, orjson.dumps(data))
 
     def get_price(self, symbol: str) -> Optional[float]:
         """Retrieve price from cache
@@ -45,10 +90,30 @@ class RedisCache:
         data = self.client.get(key)
         if not data:
             return None
-        return float(json.loads(data)["price"])
+        return float(orjson.loads(data)["price"])
+
+    def get_prices_batch(self, symbols: list[str]) -> dict[str, float]:
+        """Retrieve multiple prices in a single MGET round trip
+
+        Args:
+            symbols: List of cryptocurrency symbols (e.g., ['BTCUSDT', 'ETHUSDT'])
+
+        Returns:
+            Dictionary mapping symbol to price, only for symbols found in cache
+        """
+        if not symbols:
+            return {}
+
+        symbols_upper = [s.upper() for s in symbols]
+        values = self.client.mget([f"price:{s}" for s in symbols_upper])
+        return {
+            symbol: float(orjson.loads(data)["price"])
+            for symbol, data in zip(symbols_upper, values)
+            if data
+        }
 
     def set_prices_batch(self, prices: dict[str, float], ttl: int = 5) -> None:
-        """Store multiple prices atomically using pipeline
+        """Store multiple prices in one round trip using pipeline
 
         Args:
             prices: Dictionary mapping symbol to price
@@ -57,7 +122,8 @@ class RedisCache:
         if not prices:
             return
 
-        pipe = self.client.pipeline()
+        # Prices are independent keys, so skip the MULTI/EXEC wrapping
+        pipe = self.client.pipeline(transaction=False)
         timestamp = time.time()
 
         for symbol, price in prices.items():
@@ -67,14 +133,14 @@ class RedisCache:
                 "timestamp": timestamp,
                 "source": "binance"
             }
-            pipe.setex(key, ttl, json.dumps(data))
+            pipe.setex(key, ttl, orjson.dumps(data))
 
         pipe.execute()
 
     def set_symbols(self, quote_asset: str, symbols: list[str], ttl: int = 3600) -> None:
         """Cache a list of trading symbols for a given quote asset."""
         key = f"symbols:{quote_asset.upper()}"
-        self.client.setex(key, ttl, json.dumps(symbols))
+        self.client.setex(key, ttl, orjson.dumps(symbols))
 
     def get_symbols(self, quote_asset: str) -> Optional[list[str]]:
         """Retrieve cached symbols for a quote asset."""
@@ -82,12 +148,12 @@ class RedisCache:
         data = self.client.get(key)
         if not data:
             return None
-        return json.loads(data)
+        return orjson.loads(data)
 
     def set_bot_state(self, bot_id: int, state: dict) -> None:
         """Store trading bot runtime state (positions, lowest_price, etc.)."""
         key = f"bot_state:{bot_id}"
-        self.client.set(key, json.dumps(state))
+        self.client.set(key, orjson.dumps(state))
 
     def get_bot_state(self, bot_id: int) -> Optional[dict]:
         """Retrieve trading bot runtime state."""
@@ -95,9 +161,62 @@ class RedisCache:
         data = self.client.get(key)
         if not data:
             return None
-        return json.loads(data)
+        return orjson.loads(data)
 
     def delete_bot_state(self, bot_id: int) -> None:
         """Remove trading bot runtime state."""
         key = f"bot_state:{bot_id}"
         self.client.delete(key)
+
+    def get_bot_states_batch(self, bot_ids: list[int]) -> dict[int, dict]:
+        """Retrieve runtime states for several bots in one MGET (bots without state are omitted)."""
+        if not bot_ids:
+            return {}
+        values = self.client.mget([f"bot_state:{bot_id}" for bot_id in bot_ids])
+        return {bot_id: orjson.loads(data) for bot_id, data in zip(bot_ids, values) if data}
+
+    def set_bot_states_batch(self, states: dict[int, dict]) -> None:
+        """Store runtime states for several bots in one MSET."""
+        if not states:
+            return
+        self.client.mset({f"bot_state:{bot_id}": orjson.dumps(state) for bot_id, state in states.items()})
+
+    def delete_bot_states(self, bot_ids: list[int]) -> None:
+        """Remove runtime states for several bots in one DEL."""
+        if bot_ids:
+            self.client.delete(*[f"bot_state:{bot_id}" for bot_id in bot_ids])
+
+    def publish_symbols_changed(self) -> None:
+        """Tell the WebSocket worker to reload the symbols it tracks."""
+        self.client.publish(SYMBOLS_CHANGED_CHANNEL, "")
+
+    def acquire_lock(self, name: str, ttl: int) -> Optional[str]:
+        """Take a lock that expires after ttl seconds.
+
+        Returns:
+            A token to pass to release_lock, or None if the lock is already held
+        """
+        token = secrets.token_hex(16)
+        if self.client.set(f"lock:{name}", token, nx=True, ex=ttl):
+            return token
+        return None
+
+    def release_lock(self, name: str, token: str) -> None:
+        """Release a lock taken with acquire_lock, unless it expired and was taken again."""
+        self.client.eval(_RELEASE_LOCK_SCRIPT, 1, f"lock:{name}", token)
+
+    def take_rate_token(self, name: str, per_minute: int, burst: int) -> float:
+        """Take one token from a rate limit shared by all processes using this Redis.
+
+        Args:
+            name: Rate limit name (e.g., 'binance_klines')
+            per_minute: Sustained rate, in tokens per minute
+            burst: Most tokens that can be taken at once after an idle period
+
+        Returns:
+            0.0 if a token was taken, else the seconds to wait before trying again
+        """
+        wait = self.client.eval(
+            _TAKE_TOKEN_SCRIPT, 1, f"ratelimit:{name}", burst, per_minute / 60.0, time.time()
+        )
+        return float(wait)
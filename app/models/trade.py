@@ -1,4 +1,4 @@
-from sqlalchemy import String, Integer, Float, DateTime, func, ForeignKey
+from sqlalchemy import String, Integer, Float, DateTime, func, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column
 from app.core.db import Base
 
@@ -12,3 +12,7 @@ class Trade(Base):
     price: Mapped[float] = mapped_column(Float, nullable=False)
     quantity: Mapped[float] = mapped_column(Float, nullable=False)
     created_at: Mapped[str] = mapped_column(DateTime, server_default=func.now(), index=True)
+
+
+# Composite index for efficient queries: a bot's trades in chronological order
+Index("ix_trades_bot_created", Trade.trading_bot_id, Trade.created_at)
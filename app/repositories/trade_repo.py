@@ -1,3 +1,4 @@
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 from app.models.trade import Trade
 
@@ -18,6 +19,13 @@ class TradeRepository:
         self.db.refresh(row)
         return row
 
+    def create_many(self, rows: list[dict]) -> None:
+        """Insert several trades in one executemany INSERT and a single commit
+        (e.g. sells closed on the same tick)."""
+        if rows:
+            self.db.execute(insert(Trade), rows)
+        self.db.commit()
+
     def list_by_bot(self, trading_bot_id: int) -> list[Trade]:
         return (
             self.db.query(Trade)
@@ -26,6 +34,19 @@ class TradeRepository:
             .all()
         )
 
+    def list_by_bot_chronological(self, trading_bot_id: int) -> list[Trade]:
+        """List a bot's trades oldest first, for FIFO replay.
+
+        Sorted by the (trading_bot_id, created_at) index; id breaks ties between
+        trades written in the same second.
+        """
+        return (
+            self.db.query(Trade)
+            .filter(Trade.trading_bot_id == trading_bot_id)
+            .order_by(Trade.created_at, Trade.id)
+            .all()
+        )
+
     def delete_by_bot(self, trading_bot_id: int) -> int:
         """Delete all trades for a bot. Returns count of deleted rows."""
         count = (
@@ -1,5 +1,6 @@
 from sqlalchemy.orm import Session, joinedload
 from app.models.trading_bot import TradingBot
+from app.models.trade import Trade
 from app.models.user import User
 
 
@@ -68,6 +69,24 @@ class TradingBotRepository:
         self.db.refresh(row)
         return row
 
+    def activate_many(self, user_id: int, bot_ids: list[int]) -> list[int]:
+        """Activate the user's inactive bots among bot_ids. Returns the reactivated ids."""
+        if not bot_ids:
+            return []
+        rows = (
+            self.db.query(TradingBot)
+            .filter(
+                TradingBot.user_id == user_id,
+                TradingBot.id.in_(bot_ids),
+                TradingBot.is_active == 0,
+            )
+            .all()
+        )
+        for row in rows:
+            row.is_active = 1
+        self.db.commit()
+        return [row.id for row in rows]
+
     def delete(self, user_id: int, bot_id: int) -> bool:
         row = self.get_by_id(user_id, bot_id)
         if not row:
@@ -76,6 +95,21 @@ class TradingBotRepository:
         self.db.commit()
         return True
 
+    def delete_with_trades(self, user_id: int, bot_id: int) -> bool:
+        """Delete a bot and its trades in a single transaction."""
+        row = self.get_by_id(user_id, bot_id)
+        if not row:
+            return False
+        try:
+            # Trades first (foreign key constraint)
+            self.db.query(Trade).filter(Trade.trading_bot_id == bot_id).delete()
+            self.db.delete(row)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return True
+
     # Worker usage
     def list_active_symbols(self) -> list[str]:
         """Get distinct active symbols for price caching"""
@@ -87,21 +121,12 @@ class TradingBotRepository:
         )
         return [row[0] for row in result]
 
-    def list_active_ids(self) -> list[int]:
-        """Get all active bot IDs (for worker restart)"""
-        result = (
-            self.db.query(TradingBot.id)
-            .filter(TradingBot.is_active == 1)
-            .all()
-        )
-        return [row[0] for row in result]
-
-    def get_active_by_id(self, bot_id: int) -> TradingBot | None:
-        """Get an active bot by id (no user filter, for worker usage)"""
+    def list_active(self) -> list[TradingBot]:
+        """Get all active bots (for the worker's strategy tick)"""
         return (
             self.db.query(TradingBot)
-            .filter(TradingBot.id == bot_id, TradingBot.is_active == 1)
-            .first()
+            .filter(TradingBot.is_active == 1)
+            .all()
         )
 
     def get_user_for_bot(self, bot_id: int) -> User | None:
@@ -20,6 +20,14 @@ class TradingBotUpdate(BaseModel):
     is_active: int | None = Field(None, ge=0, le=1)
 
 
+class TradingBotReactivate(BaseModel):
+    bot_ids: list[int] = Field(..., min_length=1, max_length=500, description="Bots to reactivate")
+
+
+class TradingBotReactivateResult(BaseModel):
+    reactivated: list[int] = Field(..., description="Ids of the bots that were inactive and are now active")
+
+
 class BotStats(BaseModel):
     bot_id: int
     symbol: str
@@ -1,9 +1,10 @@
 """Backtest engine: replays historical prices through decide_trade()."""
 
 import math
-from types import SimpleNamespace
+from concurrent.futures import Executor
+from functools import partial
 from dataclasses import dataclass
-from app.services.trading_strategy import decide_trade
+from app.services.trading_strategy import BotParams, decide_trade
 from app.core.config import settings
 
 
@@ -52,7 +53,28 @@ def run_backtest(
     Returns:
         BacktestResult with all performance metrics.
     """
-    bot = SimpleNamespace(
+    # The first buy needs a price inside [min_price, max_price]; without one no
+    # trade can ever fire, so skip replaying the ticks
+    if not any(min_price <= p <= max_price for p in close_prices):
+        return BacktestResult(
+            total_pnl=0.0,
+            total_pnl_pct=0.0,
+            num_trades=0,
+            num_buys=0,
+            num_sells=0,
+            win_rate=0.0,
+            max_drawdown=0.0,
+            sharpe_ratio=0.0,
+            final_open_positions=0,
+            unrealized_pnl=0.0,
+            min_price=min_price,
+            max_price=max_price,
+            grid_levels=grid_levels,
+            sell_percentage=sell_percentage,
+            total_amount=total_amount,
+        )
+
+    bot = BotParams(
         id=0,
         symbol=symbol,
         min_price=min_price,
@@ -72,6 +94,9 @@ def run_backtest(
 
     previous_price: float | None = None
     open_buys: list[tuple[float, float]] = []  # (entry_price, quantity)
+    # Running totals over open_buys, so equity is O(1) per tick instead of a re-sum
+    open_qty = 0.0
+    open_cost = 0.0  # entry value plus buy fees
     realized_pnl = 0.0
     winning_sells = 0
     num_buys = 0
@@ -86,12 +111,15 @@ def run_backtest(
         decisions, state = decide_trade(bot, price, state, previous_price)
 
         for d in decisions:
-            if d["side"] == "buy":
+            if d.side == "buy":
                 num_buys += 1
-                open_buys.append((d["entry_price"], d["quantity"]))
-            elif d["side"] == "sell":
+                open_buys.append((d.entry_price, d.quantity))
+                buy_cost = d.entry_price * d.quantity
+                open_qty += d.quantity
+                open_cost += buy_cost + buy_cost * fee_pct
+            elif d.side == "sell":
                 num_sells += 1
-                sell_value = d["entry_price"] * d["quantity"]
+                sell_value = d.entry_price * d.quantity
                 sell_fee = sell_value * fee_pct
                 if open_buys:
                     buy_price, buy_qty = open_buys.pop(0)
@@ -101,12 +129,16 @@ def run_backtest(
                     realized_pnl += trade_pnl
                     if trade_pnl > 0:
                         winning_sells += 1
+                    if open_buys:
+                        open_qty -= buy_qty
+                        open_cost -= buy_cost + buy_fee
+                    else:
+                        # Flat again: reset so subtraction drift can't accumulate
+                        open_qty = 0.0
+                        open_cost = 0.0
 
         # Compute equity: remaining cash + value of open positions
-        invested = sum(bp * bq + bp * bq * fee_pct for bp, bq in open_buys)
-        open_value = sum(bq * price for _, bq in open_buys)
-        unrealized = open_value - invested
-        equity = total_amount + realized_pnl + unrealized
+        equity = total_amount + realized_pnl + (open_qty * price - open_cost)
 
         equity_curve.append(equity)
         if equity > peak_equity:
@@ -160,3 +192,45 @@ def run_backtest(
         sell_percentage=sell_percentage,
         total_amount=total_amount,
     )
+
+
+def _backtest_row(
+    symbol: str, close_prices: list[float], total_amount: float, params: dict
+) -> BacktestResult:
+    """Backtest one parameter row (module level so it can run in a worker process)."""
+    return run_backtest(
+        symbol=symbol,
+        close_prices=close_prices,
+        total_amount=total_amount,
+        **params,
+    )
+
+
+def run_backtest_sweep(
+    symbol: str,
+    close_prices: list[float],
+    total_amount: float,
+    param_rows: list[dict],
+    executor: Executor | None = None,
+) -> list[BacktestResult]:
+    """Backtest many parameter sets on the same prices.
+
+    Args:
+        symbol: Trading pair symbol.
+        close_prices: Chronological list of close prices (oldest first).
+        total_amount: Budget for every simulation.
+        param_rows: One dict per run with min_price, max_price, grid_levels
+            and sell_percentage.
+        executor: Optional pool to spread the runs over (e.g. a
+            ProcessPoolExecutor); they run inline when omitted.
+
+    Returns:
+        One BacktestResult per row, in param_rows order.
+    """
+    backtest = partial(_backtest_row, symbol, close_prices, total_amount)
+    if executor is None:
+        return [backtest(params) for params in param_rows]
+    # Runs are independent; batch them so each task carries the prices once
+    # per chunk rather than once per backtest
+    chunksize = max(1, len(param_rows) // 16)
+    return list(executor.map(backtest, param_rows, chunksize=chunksize))
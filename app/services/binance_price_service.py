@@ -1,6 +1,17 @@
+import time
 import httpx
 from app.core.config import settings
 
+USDC_SYMBOLS_TTL = 3600  # seconds; exchangeInfo only changes on listings/delistings
+PRICE_TTL = 5.0  # seconds; same freshness as the Redis price cache
+
+# Process-wide (fetched_at, symbols); services are instantiated per request
+_usdc_symbols_cache: tuple[float, list[str]] | None = None
+# Process-wide symbol -> (fetched_at, price), filled by get_price; entries older
+# than PRICE_TTL are pruned on write so the dict only holds live symbols
+_price_cache: dict[str, tuple[float, float]] = {}
+
+
 class BinancePriceService:
     """Public endpoints only: no API keys needed."""
     def __init__(self):
@@ -8,12 +19,26 @@ class BinancePriceService:
         self.client = httpx.Client(timeout=10.0)
 
     def get_price(self, symbol: str) -> float:
-        r = self.client.get(f"{self.base_url}/api/v3/ticker/price", params={"symbol": symbol.upper().strip()})
+        """Latest price for a symbol, reusing one fetched within PRICE_TTL."""
+        symbol = symbol.upper().strip()
+        cached = _price_cache.get(symbol)
+        now = time.monotonic()
+        if cached is not None and now - cached[0] < PRICE_TTL:
+            return cached[1]
+
+        r = self.client.get(f"{self.base_url}/api/v3/ticker/price", params={"symbol": symbol})
         r.raise_for_status()
-        return float(r.json()["price"])
+        price = float(r.json()["price"])
+        for stale in [s for s, (fetched_at, _) in _price_cache.items() if now - fetched_at >= PRICE_TTL]:
+            del _price_cache[stale]
+        _price_cache[symbol] = (now, price)
+        return price
 
     def get_prices_batch(self, symbols: list[str]) -> dict[str, float]:
-        """Fetch multiple prices in one API call
+        """Fetch multiple prices in one API call.
+
+        Always hits Binance: callers such as cache_prices stamp the result as
+        fresh, so it is neither served from nor written to the per-process cache.
 
         Args:
             symbols: List of cryptocurrency symbols (e.g., ['BTCUSDT', 'ETHUSDT'])
@@ -29,18 +54,26 @@ class BinancePriceService:
         r.raise_for_status()
 
         all_prices = r.json()
-        symbols_upper = {s.upper().strip() for s in symbols}
+        symbols_upper = frozenset(s.upper().strip() for s in symbols)
 
         # Filter to only requested symbols
-        result = {}
-        for item in all_prices:
-            if item["symbol"] in symbols_upper:
-                result[item["symbol"]] = float(item["price"])
-
-        return result
+        return {
+            item["symbol"]: float(item["price"])
+            for item in all_prices
+            if item["symbol"] in symbols_upper
+        }
 
     def get_usdc_symbols(self) -> list[str]:
-        """Fetch all actively trading USDC pairs from Binance exchangeInfo."""
+        """Fetch all actively trading USDC pairs from Binance exchangeInfo.
+
+        The ~2 MB exchangeInfo response is parsed at most once per
+        USDC_SYMBOLS_TTL per process.
+        """
+        global _usdc_symbols_cache
+        now = time.monotonic()
+        if _usdc_symbols_cache is not None and now - _usdc_symbols_cache[0] < USDC_SYMBOLS_TTL:
+            return list(_usdc_symbols_cache[1])
+
         r = self.client.get(f"{self.base_url}/api/v3/exchangeInfo")
         r.raise_for_status()
         data = r.json()
@@ -50,4 +83,5 @@ class BinancePriceService:
             if s["quoteAsset"] == "USDC" and s["status"] == "TRADING"
         ]
         symbols.sort()
-        return symbols
+        _usdc_symbols_cache = (now, symbols)
+        return list(symbols)
@@ -1,14 +1,25 @@
 import hashlib
 import hmac
+import threading
 import time
 import logging
-from urllib.parse import urlencode
+from collections import OrderedDict
 
 import httpx
 from app.core.config import settings
+from app.core.encryption import decrypt
+from app.models.user import User
 
 logger = logging.getLogger(__name__)
 
+TRADE_SERVICE_CACHE_SIZE = 64  # users whose client is kept warm
+TRADE_SERVICE_TTL = 600.0  # seconds before decrypted keys are dropped and rebuilt
+
+# user_id -> (encrypted api key, encrypted api secret, created at, service),
+# least recently used first
+_trade_services: OrderedDict[int, tuple[str, str, float, "BinanceTradeService"]] = OrderedDict()
+_trade_services_lock = threading.Lock()
+
 
 class BinanceTradeService:
     """Authenticated Binance API client for placing orders.
@@ -19,16 +30,17 @@ class BinanceTradeService:
     def __init__(self, api_key: str, api_secret: str):
         self.api_key = api_key
         self.api_secret = api_secret
+        # Keyed HMAC prototype: copying it skips the key setup on every signature
+        self._hmac_proto = hmac.new(api_secret.encode(), b"", hashlib.sha256)
         self.base_url = settings.BINANCE_BASE_URL.rstrip("/")
         self.client = httpx.Client(timeout=10.0)
 
     def _sign(self, params: dict) -> str:
-        query = urlencode(params)
-        return hmac.new(
-            self.api_secret.encode(),
-            query.encode(),
-            hashlib.sha256,
-        ).hexdigest()
+        # Order params are plain alphanumerics, so skip urlencode's quoting
+        query = "&".join(f"{k}={v}" for k, v in params.items())
+        mac = self._hmac_proto.copy()
+        mac.update(query.encode())
+        return mac.hexdigest()
 
     def place_order(self, symbol: str, side: str, quantity: float) -> dict:
         """Place a market order on Binance.
@@ -69,3 +81,35 @@ class BinanceTradeService:
         result = r.json()
         logger.info(f"Order executed: {side} {quantity} {symbol} - orderId={result.get('orderId')}")
         return result
+
+
+def get_trade_service(user: User) -> BinanceTradeService:
+    """Return the user's BinanceTradeService, reused across requests.
+
+    Decrypting the stored keys and opening the HTTP client happen on the first
+    call, after the user saves new keys, or once the entry is older than
+    TRADE_SERVICE_TTL; later orders reuse the keep-alive connection. At most
+    TRADE_SERVICE_CACHE_SIZE users are kept, least recently used evicted first.
+
+    Replaced or evicted services are not closed, since another request thread
+    may still be placing an order with one; their connections are released
+    when the service is garbage collected.
+    """
+    now = time.monotonic()
+    with _trade_services_lock:
+        cached = _trade_services.get(user.id)
+        if (
+            cached is not None
+            and cached[0] == user.binance_api_key
+            and cached[1] == user.binance_api_secret
+            and now - cached[2] < TRADE_SERVICE_TTL
+        ):
+            _trade_services.move_to_end(user.id)
+            return cached[3]
+
+        service = BinanceTradeService(decrypt(user.binance_api_key), decrypt(user.binance_api_secret))
+        _trade_services[user.id] = (user.binance_api_key, user.binance_api_secret, now, service)
+        _trade_services.move_to_end(user.id)
+        while len(_trade_services) > TRADE_SERVICE_CACHE_SIZE:
+            _trade_services.popitem(last=False)
+    return service
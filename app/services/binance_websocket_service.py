@@ -1,7 +1,8 @@
 import asyncio
 import json
 import logging
-from typing import Set, Callable, Optional
+import random
+from typing import Set, FrozenSet, Callable, Optional
 import websockets
 from websockets.exceptions import ConnectionClosed, WebSocketException
 from app.core.config import settings
@@ -26,18 +27,24 @@ class BinanceWebSocketService:
         # This receives updates for ALL symbols (~1-2 updates per second per active symbol)
         self.ws_url = "wss://stream.binance.com:9443/ws/!ticker@arr"
         self.cache = RedisCache()
-        self.symbols_to_track: Optional[Set[str]] = None
+        self.symbols_to_track: Optional[FrozenSet[str]] = None
         self.reconnect_delay = 5  # seconds
         self.max_reconnect_delay = 60  # max backoff
+        self.max_message_size = 16 * 1024 * 1024  # !ticker@arr frames can exceed the 1 MiB default
         self.is_running = False
 
+    @staticmethod
+    def _jitter(delay: float) -> float:
+        """Spread reconnects over [0.5, 1.5] x delay so restarted clients don't reconnect in lockstep"""
+        return delay * random.uniform(0.5, 1.5)
+
     def set_symbols_to_track(self, symbols: Optional[Set[str]]):
         """Set which symbols to cache (None = cache all symbols)"""
         if symbols is None:
             self.symbols_to_track = None
             logger.info("Tracking ALL symbols (no filter)")
         else:
-            self.symbols_to_track = {s.upper() for s in symbols}
+            self.symbols_to_track = frozenset(s.upper() for s in symbols)
             logger.info(f"Tracking {len(self.symbols_to_track)} symbols: {self.symbols_to_track}")
 
     async def connect_and_stream(self):
@@ -52,7 +59,8 @@ class BinanceWebSocketService:
                     self.ws_url,
                     ping_interval=20,  # Send ping every 20 seconds
                     ping_timeout=10,   # Wait 10 seconds for pong
-                    close_timeout=10
+                    close_timeout=10,
+                    max_size=self.max_message_size,
                 ) as websocket:
                     logger.info("WebSocket connected successfully")
                     current_delay = self.reconnect_delay  # Reset backoff on successful connection
@@ -60,18 +68,21 @@ class BinanceWebSocketService:
                     await self._stream_messages(websocket)
 
             except ConnectionClosed as e:
-                logger.warning(f"WebSocket connection closed: {e}. Reconnecting in {current_delay}s...")
-                await asyncio.sleep(current_delay)
+                sleep_for = self._jitter(current_delay)
+                logger.warning(f"WebSocket connection closed: {e}. Reconnecting in {sleep_for:.1f}s...")
+                await asyncio.sleep(sleep_for)
                 current_delay = min(current_delay * 2, self.max_reconnect_delay)
 
             except WebSocketException as e:
-                logger.error(f"WebSocket error: {e}. Reconnecting in {current_delay}s...")
-                await asyncio.sleep(current_delay)
+                sleep_for = self._jitter(current_delay)
+                logger.error(f"WebSocket error: {e}. Reconnecting in {sleep_for:.1f}s...")
+                await asyncio.sleep(sleep_for)
                 current_delay = min(current_delay * 2, self.max_reconnect_delay)
 
             except Exception as e:
-                logger.error(f"Unexpected error in WebSocket stream: {e}", exc_info=True)
-                await asyncio.sleep(current_delay)
+                sleep_for = self._jitter(current_delay)
+                logger.error(f"Unexpected error in WebSocket stream: {e}. Reconnecting in {sleep_for:.1f}s...", exc_info=True)
+                await asyncio.sleep(sleep_for)
                 current_delay = min(current_delay * 2, self.max_reconnect_delay)
 
         logger.info("WebSocket service stopped")
@@ -89,16 +100,21 @@ class BinanceWebSocketService:
                     logger.warning(f"Unexpected message format: {type(tickers)}")
                     continue
 
-                # Filter and extract prices
-                prices = {}
-                for ticker in tickers:
-                    symbol = ticker.get('s')  # Symbol (e.g., 'BTCUSDT')
-                    price = ticker.get('c')   # Current close price
-
-                    if symbol and price:
-                        # Only cache symbols we're tracking (if filter is set)
-                        if self.symbols_to_track is None or symbol in self.symbols_to_track:
-                            prices[symbol] = float(price)
+                # Filter and extract prices ('s' = symbol, 'c' = current close price)
+                # Only cache symbols we're tracking (if filter is set)
+                tracked = self.symbols_to_track
+                if tracked is None:
+                    prices = {
+                        t['s']: float(t['c'])
+                        for t in tickers
+                        if t.get('s') and t.get('c')
+                    }
+                else:
+                    prices = {
+                        t['s']: float(t['c'])
+                        for t in tickers
+                        if t.get('s') in tracked and t.get('c')
+                    }
 
                 # Batch update Redis
                 if prices:
@@ -126,30 +142,44 @@ class BinanceSymbolWebSocketService:
     """WebSocket service for specific symbols (alternative implementation)
 
     Use this if you want to stream only specific symbols instead of all tickers.
-    More efficient for small number of symbols (<10).
+    More efficient for small number of symbols (<10). Symbols are sharded over
+    several combined-stream connections so a slow or dropped connection only
+    stalls its own shard.
     """
 
+    streams_per_connection = 100
+
     def __init__(self, symbols: list[str]):
         self.symbols = [s.lower() for s in symbols]
-        # Combined streams endpoint
-        streams = "/".join([f"{s}@ticker" for s in self.symbols])
-        self.ws_url = f"wss://stream.binance.com:9443/stream?streams={streams}"
+        n = self.streams_per_connection
+        self.shards = [self.symbols[i:i + n] for i in range(0, len(self.symbols), n)]
         self.cache = RedisCache()
         self.is_running = False
 
+    @staticmethod
+    def _stream_url(symbols: list[str]) -> str:
+        # Combined streams endpoint
+        streams = "/".join([f"{s}@ticker" for s in symbols])
+        return f"wss://stream.binance.com:9443/stream?streams={streams}"
+
     async def connect_and_stream(self):
-        """Stream specific symbols"""
+        """Stream specific symbols, one connection per shard"""
         self.is_running = True
+        await asyncio.gather(*(self._stream_shard(shard) for shard in self.shards))
+
+    async def _stream_shard(self, symbols: list[str]):
+        """Stream one shard of symbols with automatic reconnection"""
+        ws_url = self._stream_url(symbols)
 
         while self.is_running:
             try:
-                logger.info(f"Connecting to Binance WebSocket for symbols: {self.symbols}")
+                logger.info(f"Connecting to Binance WebSocket for symbols: {symbols}")
                 async with websockets.connect(
-                    self.ws_url,
+                    ws_url,
                     ping_interval=20,
                     ping_timeout=10
                 ) as websocket:
-                    logger.info("WebSocket connected")
+                    logger.info(f"WebSocket connected ({len(symbols)} symbols)")
 
                     async for message in websocket:
                         try:
@@ -3,7 +3,11 @@
 import io
 import logging
 import zipfile
+from array import array
+from dataclasses import dataclass, field
+from contextlib import nullcontext
 from datetime import datetime, timedelta, timezone
+from itertools import chain
 from urllib.request import urlopen
 from urllib.error import HTTPError
 
@@ -12,31 +16,86 @@ logger = logging.getLogger(__name__)
 VISION_BASE_URL = "https://data.binance.vision/data/spot/daily/klines"
 
 
+@dataclass
+class Klines:
+    """OHLCV candles stored column-wise, one typed array per field.
+
+    Uses ~8 bytes per value instead of a dict per candle, which matters
+    for multi-day 1s Vision downloads (hundreds of thousands of candles).
+    """
+
+    time: array = field(default_factory=lambda: array("q"))
+    open: array = field(default_factory=lambda: array("d"))
+    high: array = field(default_factory=lambda: array("d"))
+    low: array = field(default_factory=lambda: array("d"))
+    close: array = field(default_factory=lambda: array("d"))
+    volume: array = field(default_factory=lambda: array("d"))
+
+    def __len__(self) -> int:
+        return len(self.time)
+
+    def append(self, time: int, open: float, high: float, low: float, close: float, volume: float) -> None:
+        self.time.append(time)
+        self.open.append(open)
+        self.high.append(high)
+        self.low.append(low)
+        self.close.append(close)
+        self.volume.append(volume)
+
+    @classmethod
+    def from_rows(cls, rows: list) -> "Klines":
+        """Build from raw Binance kline rows ([open_time, open, high, low, close, volume, ...])."""
+        return cls(
+            time=array("q", (int(k[0]) for k in rows)),
+            open=array("d", (float(k[1]) for k in rows)),
+            high=array("d", (float(k[2]) for k in rows)),
+            low=array("d", (float(k[3]) for k in rows)),
+            close=array("d", (float(k[4]) for k in rows)),
+            volume=array("d", (float(k[5]) for k in rows)),
+        )
+
+    def to_records(self) -> list[dict]:
+        """Row-wise view (list of dicts with time/open/high/low/close/volume keys)."""
+        return [
+            {"time": t, "open": o, "high": h, "low": l, "close": c, "volume": v}
+            for t, o, h, l, c, v in zip(
+                self.time, self.open, self.high, self.low, self.close, self.volume
+            )
+        ]
+
+
 def fetch_klines(
     symbol: str,
     interval: str = "1h",
     limit: int = 2000,
-) -> list[dict]:
+    client=None,
+) -> Klines:
     """Fetch OHLCV klines from Binance, paginating if limit > 1000.
 
     Args:
         symbol: Trading pair (e.g., "BTCUSDT").
         interval: Candle interval (e.g., "1h", "4h", "1d").
         limit: Total number of candles to fetch (can exceed 1000).
+        client: Optional shared httpx.Client, so callers fetching many
+            symbols reuse keep-alive connections. A one-off client is used
+            (and closed) when omitted.
 
     Returns:
-        List of kline dicts sorted chronologically (oldest first).
-        Each dict has keys: time, open, high, low, close, volume.
+        Klines sorted chronologically (oldest first).
     """
     import httpx
     from app.core.config import settings
 
     base_url = settings.BINANCE_BASE_URL
-    all_klines: list[dict] = []
+    pages: list[list] = []  # newest page first
     end_time: int | None = None
     remaining = limit
 
-    with httpx.Client(timeout=15.0) as client:
+    owned = client is None
+    if owned:
+        client = httpx.Client(timeout=15.0)
+
+    with client if owned else nullcontext(client):
         while remaining > 0:
             batch_size = min(remaining, 1000)
             params: dict = {
@@ -54,20 +113,8 @@ def fetch_klines(
             if not data:
                 break
 
-            batch = [
-                {
-                    "time": int(k[0]),
-                    "open": float(k[1]),
-                    "high": float(k[2]),
-                    "low": float(k[3]),
-                    "close": float(k[4]),
-                    "volume": float(k[5]),
-                }
-                for k in data
-            ]
-
-            all_klines = batch + all_klines
-            remaining -= len(batch)
+            pages.append(data)
+            remaining -= len(data)
 
             if len(data) < batch_size:
                 break
@@ -75,11 +122,12 @@ def fetch_klines(
             # Next page: before the oldest candle in this batch
             end_time = data[0][0] - 1
 
-    # Trim to exact limit (keep the most recent)
-    if len(all_klines) > limit:
-        all_klines = all_klines[-limit:]
+    # Stitch pages oldest first (single copy), then trim to exact limit (keep the most recent)
+    all_rows = list(chain.from_iterable(reversed(pages)))
+    if len(all_rows) > limit:
+        all_rows = all_rows[-limit:]
 
-    return all_klines
+    return Klines.from_rows(all_rows)
 
 
 def fetch_klines_vision(
@@ -87,7 +135,7 @@ def fetch_klines_vision(
     interval: str = "1s",
     days: int = 7,
     on_progress: callable = None,
-) -> list[dict]:
+) -> Klines:
     """Fetch klines from Binance Vision historical data archives.
 
     Downloads daily ZIP/CSV files from https://data.binance.vision.
@@ -101,10 +149,10 @@ def fetch_klines_vision(
         on_progress: Optional callback(day_num, total_days, date_str).
 
     Returns:
-        List of kline dicts sorted chronologically (oldest first).
+        Klines sorted chronologically (oldest first).
     """
     symbol = symbol.upper()
-    all_klines: list[dict] = []
+    all_klines = Klines()
 
     # Vision data has a ~1 day delay; start from 2 days ago to be safe
     today = datetime.now(timezone.utc).date()
@@ -138,14 +186,14 @@ def fetch_klines_vision(
                         if timestamp > 1e15:
                             timestamp = timestamp // 1000
 
-                        all_klines.append({
-                            "time": timestamp,
-                            "open": float(parts[1]),
-                            "high": float(parts[2]),
-                            "low": float(parts[3]),
-                            "close": float(parts[4]),
-                            "volume": float(parts[5]),
-                        })
+                        all_klines.append(
+                            timestamp,
+                            float(parts[1]),
+                            float(parts[2]),
+                            float(parts[3]),
+                            float(parts[4]),
+                            float(parts[5]),
+                        )
 
         except HTTPError as e:
             if e.code == 404:
@@ -1,8 +1,9 @@
 """Grid-search parameter optimizer for trading bots."""
 
 import logging
+from concurrent.futures import Executor
 from dataclasses import dataclass
-from app.services.backtest_engine import run_backtest, BacktestResult
+from app.services.backtest_engine import run_backtest, run_backtest_sweep, BacktestResult
 
 logger = logging.getLogger(__name__)
 
@@ -77,6 +78,7 @@ def optimize_parameters(
     grid_levels_options: list[int] | None = None,
     sell_percentage_options: list[float] | None = None,
     top_n: int = 10,
+    executor: Executor | None = None,
 ) -> OptimizationResult:
     """Run grid-search optimization with train/test split.
 
@@ -94,6 +96,8 @@ def optimize_parameters(
         grid_levels_options: Grid levels to test.
         sell_percentage_options: Sell percentages to test.
         top_n: Number of top results to return.
+        executor: Optional pool to spread the combinations over (e.g. a
+            ProcessPoolExecutor); they run inline when omitted.
 
     Returns:
         OptimizationResult with best params and validation.
@@ -110,15 +114,7 @@ def optimize_parameters(
 
     logger.info(f"Optimizing {symbol}: {len(combos)} combinations on {len(train_prices)} train prices")
 
-    results: list[BacktestResult] = []
-    for params in combos:
-        result = run_backtest(
-            symbol=symbol,
-            close_prices=train_prices,
-            total_amount=total_amount,
-            **params,
-        )
-        results.append(result)
+    results = run_backtest_sweep(symbol, train_prices, total_amount, combos, executor=executor)
 
     # Sort by total_pnl_pct descending
     results.sort(key=lambda r: r.total_pnl_pct, reverse=True)
@@ -1,11 +1,34 @@
+import logging
+import redis
 from sqlalchemy.orm import Session
+from app.core.cache import RedisCache
 from app.repositories.portfolio_repo import PortfolioRepository
 from app.services.binance_price_service import BinancePriceService
 
+logger = logging.getLogger(__name__)
+
 class PortfolioService:
-    def __init__(self, db: Session, price_service: BinancePriceService | None = None):
+    def __init__(
+        self,
+        db: Session,
+        price_service: BinancePriceService | None = None,
+        cache: RedisCache | None = None,
+    ):
         self.repo = PortfolioRepository(db)
         self.prices = price_service or BinancePriceService()
+        self.cache = cache or RedisCache()
+
+    def _get_prices(self, symbols: list[str]) -> dict[str, float]:
+        """Read prices from Redis (fed by the WebSocket worker), then Binance for misses."""
+        try:
+            price_map = self.cache.get_prices_batch(symbols)
+        except redis.RedisError as e:
+            logger.warning(f"Price cache unavailable, falling back to Binance: {e}")
+            price_map = {}
+        missing = [s for s in symbols if s.upper() not in price_map]
+        if missing:
+            price_map.update(self.prices.get_prices_batch(missing))
+        return price_map
 
     def list_assets(self, user_id: int):
         return self.repo.list_by_user(user_id)
@@ -20,8 +43,12 @@ class PortfolioService:
         assets = self.repo.list_by_user(user_id)
         total = 0.0
         items = []
+        # Cached/batched prices for all assets, per-symbol lookup only for misses
+        price_map = self._get_prices([a.symbol for a in assets])
         for a in assets:
-            price = self.prices.get_price(a.symbol)
+            price = price_map.get(a.symbol.upper())
+            if price is None:
+                price = self.prices.get_price(a.symbol)
             value = price * a.quantity
             total += value
             items.append({
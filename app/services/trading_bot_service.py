@@ -1,8 +1,10 @@
+import logging
+import redis
 from sqlalchemy.orm import Session
 from app.repositories.trading_bot_repo import TradingBotRepository
-from app.repositories.trade_repo import TradeRepository
 from app.core.cache import RedisCache
-from app.workers.celery_app import celery
+
+logger = logging.getLogger(__name__)
 
 
 class TradingBotService:
@@ -13,9 +15,26 @@ class TradingBotService:
         if min_price >= max_price:
             raise ValueError("min_price must be less than max_price")
 
-    def _launch_bot_task(self, bot_id: int):
-        """Launch a long-running Celery task for this bot"""
-        celery.send_task("app.workers.tasks.run_trading_bot", args=[bot_id])
+    def _clear_bot_states(self, bot_ids: list[int]):
+        """Drop the Redis state of stopped or restarted bots.
+
+        The worker rebuilds a missing state from the bot's trades, so a bot coming
+        back never resumes from a state written while it was being stopped.
+        """
+        if not bot_ids:
+            return
+        try:
+            RedisCache().delete_bot_states(bot_ids)
+        except redis.RedisError as e:
+            logger.warning(f"Bots {bot_ids}: failed to delete Redis state: {e}")
+
+    def _notify_symbols_changed(self):
+        """Make the WebSocket worker reload the active symbols now"""
+        try:
+            RedisCache().publish_symbols_changed()
+        except redis.RedisError as e:
+            # The worker still reloads them on its periodic safety refresh
+            logger.warning(f"Failed to publish symbol change: {e}")
 
     def create(
         self,
@@ -37,9 +56,17 @@ class TradingBotService:
             sell_percentage=sell_percentage,
             grid_levels=grid_levels,
         )
-        self._launch_bot_task(bot.id)
+        self._notify_symbols_changed()
         return bot
 
+    def bulk_reactivate(self, user_id: int, bot_ids: list[int]) -> list[int]:
+        """Reactivate several bots; the worker's next tick picks them up"""
+        reactivated = self.repo.activate_many(user_id, bot_ids)
+        if reactivated:
+            self._clear_bot_states(reactivated)
+            self._notify_symbols_changed()
+        return reactivated
+
     def list(self, user_id: int):
         return self.repo.list_by_user(user_id)
 
@@ -62,7 +89,8 @@ class TradingBotService:
         if not bot:
             return None
 
-        was_inactive = bot.is_active == 0
+        was_active = bot.is_active == 1
+        old_symbol = bot.symbol
         new_min = min_price if min_price is not None else bot.min_price
         new_max = max_price if max_price is not None else bot.max_price
         self._validate_prices(new_min, new_max)
@@ -79,24 +107,28 @@ class TradingBotService:
             is_active=is_active,
         )
 
-        # Launch task if bot was reactivated
-        if updated and was_inactive and is_active == 1:
-            self._launch_bot_task(bot_id)
+        if updated:
+            activity_changed = is_active is not None and (is_active == 1) != was_active
+            # Deactivated or reactivated: start from the trades next time it runs
+            if activity_changed:
+                self._clear_bot_states([bot_id])
+            if activity_changed or updated.symbol != old_symbol:
+                self._notify_symbols_changed()
 
         return updated
 
     def deactivate(self, user_id: int, bot_id: int):
-        return self.repo.deactivate(user_id, bot_id)
+        bot = self.repo.deactivate(user_id, bot_id)
+        if bot:
+            self._clear_bot_states([bot_id])
+            self._notify_symbols_changed()
+        return bot
 
     def delete(self, user_id: int, bot_id: int) -> bool:
-        bot = self.repo.get_by_id(user_id, bot_id)
-        if not bot:
+        # Bot and trades go in one transaction so a crash can't leave orphans
+        if not self.repo.delete_with_trades(user_id, bot_id):
             return False
-        # Delete associated trades first (foreign key constraint)
-        TradeRepository(self.repo.db).delete_by_bot(bot_id)
         # Clean up Redis state
-        try:
-            RedisCache().delete_bot_state(bot_id)
-        except Exception:
-            pass
-        return self.repo.delete(user_id, bot_id)
+        self._clear_bot_states([bot_id])
+        self._notify_symbols_changed()
+        return True
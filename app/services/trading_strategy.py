@@ -9,11 +9,55 @@ Implements a grid buy/sell strategy with evenly-spaced price levels:
 """
 
 import logging
+from dataclasses import dataclass
+from bisect import bisect_right
+from functools import lru_cache
+from operator import neg
+from typing import NamedTuple
 from app.models.trading_bot import TradingBot
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Strategy settings are fixed for the life of the process; read them once
+_FEE_PCT = settings.FEE_PCT
+_BUY_PULLBACK_FACTOR = 1.0 + settings.BUY_PULLBACK_PCT
+_SELL_PULLBACK_FACTOR = 1.0 - settings.SELL_PULLBACK_PCT
+_NO_GRID_TARGET = float("-inf")
+
+
+class Decision(NamedTuple):
+    """A trade decided on one tick (a plain tuple, cheap to build on the hot path)."""
+
+    side: str  # "buy" | "sell"
+    quantity: float
+    entry_price: float
+
+
+@dataclass(slots=True, frozen=True)
+class BotParams:
+    """Bot configuration for callers without a TradingBot row (backtests, tests).
+
+    Slotted, so the attribute reads on every tick skip the instance dict.
+    """
+
+    id: int
+    symbol: str
+    max_price: float
+    min_price: float
+    total_amount: float
+    grid_levels: int
+    sell_percentage: float
+
+
+@lru_cache(maxsize=512)
+def _grid_levels(max_price: float, min_price: float, grid_levels: int) -> tuple[float, ...]:
+    """Memoized grid computation; bot parameters repeat across ticks and cycles."""
+    if grid_levels <= 1 or max_price <= min_price:
+        return ()
+    step = (max_price - min_price) / grid_levels
+    return tuple(max_price - i * step for i in range(1, grid_levels))
+
 
 def compute_grid(max_price: float, min_price: float, grid_levels: int) -> list[float]:
     """Compute the grid price levels between max_price and min_price.
@@ -21,50 +65,50 @@ def compute_grid(max_price: float, min_price: float, grid_levels: int) -> list[f
     Returns grid_levels-1 evenly-spaced levels between max_price and min_price.
     If max_price <= min_price or grid_levels <= 1, returns [].
     """
-    if grid_levels <= 1 or max_price <= min_price:
-        return []
-    step = (max_price - min_price) / grid_levels
-    return [max_price - i * step for i in range(1, grid_levels)]
+    return list(_grid_levels(max_price, min_price, grid_levels))
+
+
+def _first_level_below(grid_prices: list[float], price: float) -> int:
+    """Index of the first grid level strictly below price (len(grid_prices) if none).
+
+    grid_prices is descending, so bisect on the negated values (ascending).
+    """
+    return bisect_right(grid_prices, -price, key=neg)
 
 
 def decide_trade(
-    bot: TradingBot,
+    bot: TradingBot | BotParams,
     current_price: float,
     state: dict,
     previous_price: float | None,
-) -> tuple[list[dict], dict]:
+) -> tuple[list[Decision], dict]:
     """Decide whether to buy, sell, or do nothing.
 
     Args:
         bot: The trading bot configuration.
         current_price: Current market price from Redis.
-        state: Runtime state from Redis (positions, lowest_price, grid_prices, next_grid_index).
+        state: Runtime state from Redis (positions, lowest_price, grid_prices, next_grid_index,
+            min_entry).
         previous_price: Price from the previous tick (None on first tick).
 
     Returns:
         A tuple of (decisions, updated_state).
-        decisions: list of {"side": "buy"|"sell", "quantity": float, "entry_price": float}
+        decisions: list of Decision(side="buy"|"sell", quantity, entry_price)
         updated_state: the new state to persist in Redis.
     """
     positions = state.get("positions", [])
     lowest_price = state.get("lowest_price")
     grid_prices = state.get("grid_prices", [])
     next_grid_index = state.get("next_grid_index", 0)
+    min_entry = state.get("min_entry")
     decisions = []
-
-    buy_pullback_pct = settings.BUY_PULLBACK_PCT
-    sell_pullback_pct = settings.SELL_PULLBACK_PCT
-    fee_pct = settings.FEE_PCT
+    fee_pct = _FEE_PCT
 
     # === No positions: first buy or restart after all sold ===
     if not positions:
         if bot.min_price <= current_price <= bot.max_price:
             qty = bot.total_amount / bot.grid_levels / current_price
-            decisions.append({
-                "side": "buy",
-                "quantity": qty,
-                "entry_price": current_price,
-            })
+            decisions.append(Decision("buy", qty, current_price))
             positions.append({
                 "qty": qty,
                 "entry": current_price,
@@ -74,55 +118,60 @@ def decide_trade(
             # Grid levels are pre-computed between max_price and min_price
             grid_prices = compute_grid(bot.max_price, bot.min_price, bot.grid_levels)
             # Find first grid level below the buy price
-            next_grid_index = len(grid_prices)
-            for i, gp in enumerate(grid_prices):
-                if gp < current_price:
-                    next_grid_index = i
-                    break
+            next_grid_index = _first_level_below(grid_prices, current_price)
             lowest_price = None
-            logger.info(
-                f"Bot {bot.id}: BUY @ {current_price:.8f} "
-                f"(qty: {qty:.6f}, positions: {len(positions)}, "
-                f"grid: {len(grid_prices)} levels)"
-            )
+            min_entry = current_price
+            # Guarded: backtests call this per tick with INFO usually filtered out
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    f"Bot {bot.id}: BUY @ {current_price:.8f} "
+                    f"(qty: {qty:.6f}, positions: {len(positions)}, "
+                    f"grid: {len(grid_prices)} levels)"
+                )
         state["positions"] = positions
         state["lowest_price"] = lowest_price
         state["grid_prices"] = grid_prices
         state["next_grid_index"] = next_grid_index
+        state["min_entry"] = min_entry
         return decisions, state
 
     # === Update lowest_price tracking ===
     if lowest_price is None or current_price < lowest_price:
         lowest_price = current_price
 
-    # === Update highest per position ===
-    for pos in positions:
-        if current_price > pos["highest"]:
-            pos["highest"] = current_price
-
-    # === Check sells ===
-    to_close = []
-    for pos in positions:
-        gain_pct = current_price / pos["entry"] - 1.0
-        if gain_pct >= bot.sell_percentage / 100.0:
-            if current_price <= pos["highest"] * (1.0 - sell_pullback_pct):
-                usdc_out = pos["qty"] * current_price
-                fee = usdc_out * fee_pct
-                net_gain = usdc_out - fee - (pos["entry"] * pos["qty"]) - pos["fee"]
-                decisions.append({
-                    "side": "sell",
-                    "quantity": pos["qty"],
-                    "entry_price": current_price,
-                })
-                to_close.append(pos)
-                logger.info(
-                    f"Bot {bot.id}: SELL @ {current_price:.8f} "
-                    f"(qty: {pos['qty']:.6f}, gain: {net_gain:.4f} USDC, "
-                    f"positions: {len(positions) - len(to_close)})"
-                )
-
-    for pos in to_close:
-        positions.remove(pos)
+    # === Update highest and check sells, one pass per position ===
+    # A sell only depends on its own position's highest, so both steps fuse.
+    sell_threshold = bot.sell_percentage / 100.0
+    pullback_factor = _SELL_PULLBACK_FACTOR
+    if min_entry is None:  # state saved before min_entry was tracked
+        min_entry = min(p["entry"] for p in positions)
+    # If even the cheapest entry is below its sell threshold, no position can sell,
+    # so the scan is skipped. The highest updates it skips are below any price a sell
+    # can later be checked at, so they never change a decision.
+    if current_price / min_entry - 1.0 >= sell_threshold:
+        # Survivors are collected in the same pass instead of remove()-ing each sold position
+        kept = []
+        for pos in positions:
+            highest = pos["highest"]
+            if current_price > highest:
+                highest = pos["highest"] = current_price
+            if current_price / pos["entry"] - 1.0 >= sell_threshold:
+                if current_price <= highest * pullback_factor:
+                    decisions.append(Decision("sell", pos["qty"], current_price))
+                    if logger.isEnabledFor(logging.INFO):
+                        usdc_out = pos["qty"] * current_price
+                        fee = usdc_out * fee_pct
+                        net_gain = usdc_out - fee - (pos["entry"] * pos["qty"]) - pos["fee"]
+                        logger.info(
+                            f"Bot {bot.id}: SELL @ {current_price:.8f} "
+                            f"(qty: {pos['qty']:.6f}, gain: {net_gain:.4f} USDC, "
+                            f"positions: {len(positions) - len(decisions)})"
+                        )
+                    continue
+            kept.append(pos)
+        if decisions and kept:
+            min_entry = min(p["entry"] for p in kept)
+        positions = kept
 
     # If all positions closed, reset for next cycle
     if not positions:
@@ -133,33 +182,32 @@ def decide_trade(
         state["lowest_price"] = lowest_price
         state["grid_prices"] = grid_prices
         state["next_grid_index"] = next_grid_index
+        state["min_entry"] = None
         return decisions, state
 
     # === Check grid buy ===
+    # An exhausted grid gets a -inf target, so the check is plain float compares
+    target = grid_prices[next_grid_index] if next_grid_index < len(grid_prices) else _NO_GRID_TARGET
     if (
         previous_price is not None
-        and next_grid_index < len(grid_prices)
+        and current_price <= target
         and current_price <= bot.max_price
     ):
-        target = grid_prices[next_grid_index]
-        if current_price <= target:
-            # Price has reached the grid level, check for pullback confirmation
-            pullback_price = lowest_price * (1.0 + buy_pullback_pct)
-            if current_price < previous_price and current_price >= pullback_price:
-                qty = bot.total_amount / bot.grid_levels / current_price
-                decisions.append({
-                    "side": "buy",
-                    "quantity": qty,
-                    "entry_price": current_price,
-                })
-                positions.append({
-                    "qty": qty,
-                    "entry": current_price,
-                    "highest": current_price,
-                    "fee": qty * current_price * fee_pct,
-                })
-                next_grid_index += 1
-                lowest_price = current_price
+        # Price has reached the grid level, check for pullback confirmation
+        pullback_price = lowest_price * _BUY_PULLBACK_FACTOR
+        if current_price < previous_price and current_price >= pullback_price:
+            qty = bot.total_amount / bot.grid_levels / current_price
+            decisions.append(Decision("buy", qty, current_price))
+            positions.append({
+                "qty": qty,
+                "entry": current_price,
+                "highest": current_price,
+                "fee": qty * current_price * fee_pct,
+            })
+            next_grid_index += 1
+            lowest_price = current_price
+            min_entry = min(min_entry, current_price)
+            if logger.isEnabledFor(logging.INFO):
                 logger.info(
                     f"Bot {bot.id}: BUY @ {current_price:.8f} "
                     f"(qty: {qty:.6f}, positions: {len(positions)}, "
@@ -170,36 +218,48 @@ def decide_trade(
     state["lowest_price"] = lowest_price
     state["grid_prices"] = grid_prices
     state["next_grid_index"] = next_grid_index
+    state["min_entry"] = min_entry
     return decisions, state
 
 
-def reconstruct_state_from_trades(bot: TradingBot, trades: list) -> dict:
+def reconstruct_state_from_trades(bot: TradingBot | BotParams, trades: list) -> dict:
     """Reconstruct bot state from DB trades (for recovery after Redis data loss).
 
     Args:
         bot: The trading bot configuration.
-        trades: List of Trade objects (any order, will be sorted internally).
+        trades: List of Trade objects, ideally oldest first (as from
+            TradeRepository.list_by_bot_chronological); other orders are sorted.
 
     Returns:
         A reconstructed state dict suitable for decide_trade().
     """
-    fee_pct = settings.FEE_PCT
+    fee_pct = _FEE_PCT
 
-    # Sort chronologically (oldest first)
-    sorted_trades = sorted(trades, key=lambda t: t.created_at)
+    # Sort chronologically (oldest first), unless the query already did
+    sorted_trades = trades
+    if any(a.created_at > b.created_at for a, b in zip(trades, trades[1:])):
+        sorted_trades = sorted(trades, key=lambda t: t.created_at)
 
-    # Replay trades: BUY pushes, SELL pops (FIFO)
-    open_positions = []
+    # Replay trades: BUY pushes, SELL closes the oldest open buy (FIFO).
+    # Advancing a head index instead of pop(0) keeps long histories linear.
+    buys = []
+    first_open = 0
     for t in sorted_trades:
         if t.trade_type == "buy":
-            open_positions.append({
-                "qty": t.quantity,
-                "entry": t.price,
-                "highest": t.price,  # conservative: will catch up on next ticks
-                "fee": t.quantity * t.price * fee_pct,
-            })
-        elif t.trade_type == "sell" and open_positions:
-            open_positions.pop(0)
+            buys.append(t)
+        elif t.trade_type == "sell" and first_open < len(buys):
+            first_open += 1
+
+    # Position dicts only for the buys still open
+    open_positions = [
+        {
+            "qty": t.quantity,
+            "entry": t.price,
+            "highest": t.price,  # conservative: will catch up on next ticks
+            "fee": t.quantity * t.price * fee_pct,
+        }
+        for t in buys[first_open:]
+    ]
 
     if not open_positions:
         return {
@@ -213,11 +273,7 @@ def reconstruct_state_from_trades(bot: TradingBot, trades: list) -> dict:
     first_buy_price = open_positions[0]["entry"]
     grid_prices = compute_grid(bot.max_price, bot.min_price, bot.grid_levels)
     # Find first grid level below first buy price
-    start_index = len(grid_prices)
-    for i, gp in enumerate(grid_prices):
-        if gp < first_buy_price:
-            start_index = i
-            break
+    start_index = _first_level_below(grid_prices, first_buy_price)
     # next_grid_index = start_index + number of grid buys made
     next_grid_index = start_index + (len(open_positions) - 1)
 
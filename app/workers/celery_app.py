@@ -1,5 +1,4 @@
 from celery import Celery
-from celery.signals import worker_ready
 from app.core.config import settings
 
 celery = Celery(
@@ -9,15 +8,30 @@ celery = Celery(
     include=["app.workers.tasks", "app.workers.screening_tasks"],
 )
 
+# Bot ticks run on their own queue (and worker) so a screening run hogging the
+# main pool can't delay them past their schedule. cache_prices stays on the
+# default queue: its blocking Binance call (10 s timeout) would otherwise hold
+# up ticks until they expire, and the WebSocket worker feeds the same prices.
+BOTS_QUEUE = "bots"
+
+celery.conf.task_routes = {
+    "app.workers.tasks.tick_all_bots": {"queue": BOTS_QUEUE},
+}
+
+# Screening tasks are long and acks_late, and bot ticks expire after a second:
+# neither should sit prefetched behind a busy process
+celery.conf.worker_prefetch_multiplier = 1
+
 celery.conf.beat_schedule = {
     "cache-prices-every-3s": {
         "task": "app.workers.tasks.cache_prices",
         "schedule": 3.0,
     },
+    "tick-trading-bots-every-1s": {
+        "task": "app.workers.tasks.tick_all_bots",
+        "schedule": 1.0,
+        # A tick that waited in the queue past the next one is stale; drop it
+        "options": {"expires": 1.0},
+    },
 }
 
-
-@worker_ready.connect
-def on_worker_ready(**kwargs):
-    """When the worker starts, restart all active trading bots."""
-    celery.send_task("app.workers.tasks.restart_active_bots")
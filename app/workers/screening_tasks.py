@@ -1,10 +1,14 @@
 """Background Celery tasks for full-market screening."""
 
-import json
-import time
+import heapq
 import logging
+import time
 from datetime import datetime, timezone
 
+import orjson
+from celery import chord
+from sqlalchemy import insert
+
 from app.workers.celery_app import celery
 from app.core.cache import RedisCache
 from app.services.binance_price_service import BinancePriceService
@@ -19,7 +23,50 @@ from app.models.screening_result import ScreeningResult
 
 logger = logging.getLogger(__name__)
 
-BATCH_DELAY = 0.5  # seconds between kline fetches (Binance rate limiting)
+# Kline fetches are limited across all workers through a Redis token bucket;
+# a Celery rate_limit would only apply per worker process
+KLINES_RATE_LIMIT = "binance_klines"
+KLINES_PER_MINUTE = 120
+KLINES_BURST = 10
+RESULTS_FLUSH_EVERY = 25  # symbols processed between rewrites of the results blob
+TOP_RESULTS = 50
+PROGRESS_TTL = 3600
+
+
+def _wait_for_klines_slot(cache: RedisCache) -> None:
+    """Block until the shared kline rate limit lets this worker fetch."""
+    while True:
+        wait = cache.take_rate_token(KLINES_RATE_LIMIT, KLINES_PER_MINUTE, KLINES_BURST)
+        if wait <= 0:
+            return
+        time.sleep(wait)
+
+
+def _write_progress(
+    cache: RedisCache,
+    task_id: str,
+    total: int,
+    started_at: str,
+    processed: int,
+    top_results: list[dict],
+    status: str = "running",
+) -> None:
+    """Write the progress blob polled by GET /simulation/screening/{task_id}.
+
+    top_results must already be the best results, ordered by best_pnl_pct descending.
+    While running, the endpoint takes the live count from screening:{task_id}:processed.
+    """
+    progress_data = {
+        "task_id": task_id,
+        "status": status,
+        "progress": int(processed / total * 100) if total > 0 else 0,
+        "total_symbols": total,
+        "processed_symbols": processed,
+        "results": top_results,
+        "started_at": started_at,
+        "completed_at": datetime.now(timezone.utc).isoformat() if status == "completed" else None,
+    }
+    cache.client.setex(f"screening:{task_id}", PROGRESS_TTL, orjson.dumps(progress_data))
 
 
 @celery.task(name="app.workers.screening_tasks.run_screening", bind=True, acks_late=True)
@@ -32,15 +79,12 @@ def run_screening(
 ):
     """Screen all USDC pairs for grid trading profitability.
 
-    For each symbol:
-    1. Fetch historical klines from Binance.
-    2. Run parameter optimization (reduced grid for speed).
-    3. Store incremental progress in Redis for polling.
-    4. Store final results in database.
+    Fans out one screen_symbol task per symbol so the CPU-bound optimization
+    runs on every free worker process, then finish_screening stores the
+    final results in the database once all symbols are done.
     """
     task_id = self.request.id
     cache = RedisCache()
-    redis_key = f"screening:{task_id}"
 
     # Get all USDC symbols
     cached_symbols = cache.get_symbols("USDC")
@@ -51,35 +95,47 @@ def run_screening(
         symbols = binance.get_usdc_symbols()
 
     total = len(symbols)
-    results: list[dict] = []
     started_at = datetime.now(timezone.utc).isoformat()
 
-    def update_progress(processed: int, status: str = "running"):
-        progress_data = {
-            "task_id": task_id,
-            "status": status,
-            "progress": int(processed / total * 100) if total > 0 else 0,
-            "total_symbols": total,
-            "processed_symbols": processed,
-            "results": sorted(results, key=lambda r: r["best_pnl_pct"], reverse=True)[:50],
-            "started_at": started_at,
-            "completed_at": datetime.now(timezone.utc).isoformat() if status == "completed" else None,
-        }
-        cache.client.setex(redis_key, 3600, json.dumps(progress_data))
-
-    update_progress(0)
+    _write_progress(cache, task_id, total, started_at, 0, [])
     logger.info(f"Screening {task_id}: starting on {total} symbols")
 
-    for i, symbol in enumerate(symbols):
-        try:
-            klines = fetch_klines(symbol=symbol, interval=interval, limit=limit)
-            if len(klines) < 200:
-                logger.debug(f"Screening: skipping {symbol} ({len(klines)} klines)")
-                update_progress(i + 1)
-                time.sleep(BATCH_DELAY)
-                continue
+    if not symbols:
+        finish_screening([], task_id, user_id, total, started_at)
+        return
+
+    chord(
+        screen_symbol.s(task_id, symbol, interval, limit, total_amount, total, started_at)
+        for symbol in symbols
+    )(finish_screening.s(task_id, user_id, total, started_at))
+
+
+@celery.task(name="app.workers.screening_tasks.screen_symbol", acks_late=True)
+def screen_symbol(
+    task_id: str,
+    symbol: str,
+    interval: str,
+    limit: int,
+    total_amount: float,
+    total: int,
+    started_at: str,
+) -> dict | None:
+    """Fetch klines and optimize parameters for one symbol of a screening.
+
+    1. Fetch historical klines from Binance (within the shared rate limit).
+    2. Run parameter optimization (reduced grid for speed).
+    3. Store incremental progress in Redis for polling.
 
-            close_prices = [k["close"] for k in klines]
+    Never raises, so one failing symbol does not abort the whole chord.
+    """
+    result = None
+    try:
+        _wait_for_klines_slot(RedisCache())
+        klines = fetch_klines(symbol=symbol, interval=interval, limit=limit)
+        if len(klines) < 200:
+            logger.debug(f"Screening: skipping {symbol} ({len(klines)} klines)")
+        else:
+            close_prices = klines.close.tolist()
 
             opt = optimize_parameters(
                 symbol=symbol,
@@ -89,7 +145,7 @@ def run_screening(
                 sell_percentage_options=SCREENING_SELL_PERCENTAGES,
             )
 
-            results.append({
+            result = {
                 "symbol": symbol,
                 "best_pnl_pct": opt.best_params.total_pnl_pct,
                 "best_min_price": opt.best_params.min_price,
@@ -102,24 +158,56 @@ def run_screening(
                 "sharpe_ratio": opt.best_params.sharpe_ratio,
                 "test_pnl_pct": opt.test_result.total_pnl_pct,
                 "test_win_rate": opt.test_result.win_rate,
-            })
+            }
 
-        except Exception as e:
-            logger.warning(f"Screening: failed on {symbol}: {e}")
+    except Exception as e:
+        logger.warning(f"Screening: failed on {symbol}: {e}")
+
+    # Symbols finish on different workers, so the shared counters live in Redis:
+    # the processed count is bumped on every symbol, the results blob only every
+    # RESULTS_FLUSH_EVERY symbols, read straight from a sorted set of results.
+    try:
+        cache = RedisCache()
+        processed_key = f"screening:{task_id}:processed"
+        results_key = f"screening:{task_id}:results"
+
+        pipe = cache.client.pipeline(transaction=False)
+        pipe.incr(processed_key)
+        pipe.expire(processed_key, PROGRESS_TTL)
+        if result is not None:
+            pipe.zadd(results_key, {orjson.dumps(result): result["best_pnl_pct"]})
+            pipe.expire(results_key, PROGRESS_TTL)
+        processed = pipe.execute()[0]
+
+        if processed % RESULTS_FLUSH_EVERY == 0:
+            top_results = [orjson.loads(r) for r in cache.client.zrevrange(results_key, 0, TOP_RESULTS - 1)]
+            _write_progress(cache, task_id, total, started_at, processed, top_results)
+    except Exception as e:
+        logger.warning(f"Screening {task_id}: failed to update progress for {symbol}: {e}")
+
+    return result
 
-        update_progress(i + 1)
-        time.sleep(BATCH_DELAY)
+
+@celery.task(name="app.workers.screening_tasks.finish_screening", acks_late=True)
+def finish_screening(
+    symbol_results: list[dict | None],
+    task_id: str,
+    user_id: int,
+    total: int,
+    started_at: str,
+):
+    """Chord callback: persist screening results and mark the screening completed."""
+    results = [r for r in symbol_results if r is not None]
 
     # Persist final results to database
     db = SessionLocal()
     try:
-        for r in results:
-            row = ScreeningResult(
-                task_id=task_id,
-                user_id=user_id,
-                **r,
+        # One executemany INSERT instead of a unit-of-work flush per ORM instance
+        if results:
+            db.execute(
+                insert(ScreeningResult),
+                [{"task_id": task_id, "user_id": user_id, **r} for r in results],
             )
-            db.add(row)
         db.commit()
         logger.info(f"Screening {task_id}: saved {len(results)} results to database")
     except Exception as e:
@@ -128,5 +216,8 @@ def run_screening(
     finally:
         db.close()
 
-    update_progress(total, status="completed")
+    cache = RedisCache()
+    top_results = heapq.nlargest(TOP_RESULTS, results, key=lambda r: r["best_pnl_pct"])
+    _write_progress(cache, task_id, total, started_at, total, top_results, status="completed")
+    cache.client.delete(f"screening:{task_id}:processed", f"screening:{task_id}:results")
     logger.info(f"Screening {task_id} completed: {len(results)}/{total} symbols processed")
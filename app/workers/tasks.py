@@ -1,5 +1,7 @@
-import time
+import orjson
+from redis import RedisError
 from sqlalchemy.orm import Session
+from app.models.trading_bot import TradingBot
 from app.workers.celery_app import celery
 from app.core.db import SessionLocal
 from app.repositories.trading_bot_repo import TradingBotRepository
@@ -11,6 +13,31 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+TICK_LOCK = "tick_all_bots"
+TICK_LOCK_TTL = 10  # seconds; frees the lock if a worker dies mid-tick
+
+# Created on first use in each worker process, so its HTTP keep-alive
+# connections to Binance outlive a single task
+_binance: BinancePriceService | None = None
+
+
+def _get_binance() -> BinancePriceService:
+    global _binance
+    if _binance is None:
+        _binance = BinancePriceService()
+    return _binance
+
+
+def _recover_state(db: Session, bot: TradingBot) -> dict:
+    """Rebuild a bot's state from its DB trades (new bot, or Redis state lost)."""
+    trades = TradeRepository(db).list_by_bot_chronological(bot.id)
+    if trades:
+        return reconstruct_state_from_trades(bot, trades)
+    return {
+        "positions": [], "lowest_price": None,
+        "grid_prices": [], "next_grid_index": 0,
+    }
+
 
 @celery.task(name="app.workers.tasks.cache_prices")
 def cache_prices():
@@ -24,8 +51,7 @@ def cache_prices():
             return
 
         # Fetch prices from Binance
-        binance = BinancePriceService()
-        prices = binance.get_prices_batch(symbols)
+        prices = _get_binance().get_prices_batch(symbols)
 
         # Store in Redis
         cache = RedisCache()
@@ -37,117 +63,90 @@ def cache_prices():
         db.close()
 
 
-@celery.task(name="app.workers.tasks.restart_active_bots")
-def restart_active_bots():
-    """Restart trading bot tasks for all active bots in DB."""
-    db: Session = SessionLocal()
-    try:
-        bot_repo = TradingBotRepository(db)
-        bot_ids = bot_repo.list_active_ids()
-        if not bot_ids:
-            logger.info("No active bots to restart")
-            return
-        for bot_id in bot_ids:
-            run_trading_bot.delay(bot_id)
-            logger.info(f"Restarted trading bot task for bot_id={bot_id}")
-        logger.info(f"Restarted {len(bot_ids)} active bot(s)")
-    except Exception as e:
-        logger.error(f"Error restarting active bots: {e}", exc_info=True)
-    finally:
-        db.close()
-
-
-@celery.task(name="app.workers.tasks.run_trading_bot", bind=True)
-def run_trading_bot(self, bot_id: int):
-    """Long-running task for a single trading bot (simulated mode).
+@celery.task(name="app.workers.tasks.tick_all_bots", ignore_result=True)
+def tick_all_bots():
+    """Run one tick of the grid trading strategy for every active bot (simulated mode).
 
-    Loops every second, reads price from Redis, runs the grid trading strategy,
-    and records simulated trades in the database. No real orders are placed.
+    Scheduled by beat every second. Bots, prices and states are each read in
+    one batch, the strategy runs in-process, then the tick's trades go to the
+    database in one INSERT and the changed states to Redis in one MSET.
+    No real orders are placed.
     """
-    logger.info(f"Starting trading bot task for bot_id={bot_id}")
     cache = RedisCache()
-    iteration = 0
-    db_check_interval = 30
-    previous_price = None
+    # A slow tick must not overlap the next one, or both would trade on the same state
+    try:
+        lock_token = cache.acquire_lock(TICK_LOCK, TICK_LOCK_TTL)
+    except RedisError as e:
+        logger.error(f"Cannot take bot tick lock, skipping this tick: {e}")
+        return
+    if lock_token is None:
+        logger.warning("Previous bot tick still running, skipping this one")
+        return
 
-    default_state = {
-        "positions": [], "lowest_price": None,
-        "grid_prices": [], "next_grid_index": 0,
-    }
+    db: Session = SessionLocal()
+    try:
+        bots = TradingBotRepository(db).list_active()
+        if not bots:
+            return
 
-    # Load bot state from Redis, or reconstruct from DB trades
-    state = cache.get_bot_state(bot_id)
-    if state is None:
-        db_init: Session = SessionLocal()
-        try:
-            bot_repo_init = TradingBotRepository(db_init)
-            bot_init = bot_repo_init.get_active_by_id(bot_id)
-            if bot_init:
-                trades = TradeRepository(db_init).list_by_bot(bot_id)
-                if trades:
-                    state = reconstruct_state_from_trades(bot_init, trades)
-                    cache.set_bot_state(bot_id, state)
+        prices = cache.get_prices_batch(list({bot.symbol for bot in bots}))
+        states = cache.get_bot_states_batch([bot.id for bot in bots])
+
+        trade_rows = []
+        changed_states = {}
+        missing_prices = set()
+        for bot in bots:
+            # Read before a failure can leave the session unable to refresh the bot
+            bot_id = bot.id
+            try:
+                price = prices.get(bot.symbol.upper())
+                if price is None:
+                    missing_prices.add(bot.symbol)
+                    continue
+
+                state = states.get(bot.id)
+                saved_payload = None
+                if state is None:
+                    state = _recover_state(db, bot)
                 else:
-                    state = dict(default_state)
-            else:
-                state = dict(default_state)
-        except Exception as e:
-            logger.error(f"Bot {bot_id}: error reconstructing state: {e}", exc_info=True)
-            state = dict(default_state)
-        finally:
-            db_init.close()
-
-    while True:
-        db: Session = SessionLocal()
+                    saved_payload = orjson.dumps(state)
+
+                decisions, state = decide_trade(bot, price, state, state.get("previous_price"))
+                state["previous_price"] = price
+
+                # Persist the state only when it changed; quiet ticks often leave it as is
+                if orjson.dumps(state) != saved_payload:
+                    changed_states[bot.id] = state
+                trade_rows.extend(
+                    {
+                        "trading_bot_id": bot.id,
+                        "trade_type": decision.side,
+                        "price": decision.entry_price,
+                        "quantity": decision.quantity,
+                    }
+                    for decision in decisions
+                )
+            except Exception as e:
+                logger.error(f"Bot {bot_id}: tick failed: {e}", exc_info=True)
+                # A failed query (e.g. in state recovery) would otherwise leave the
+                # session unusable and lose the other bots' trades at create_many
+                db.rollback()
+
+        if missing_prices:
+            logger.warning(f"No price in Redis for {sorted(missing_prices)}, skipping their bots")
+
+        # Trades first: if the insert fails, the states stay unchanged and the
+        # next tick decides again instead of losing the trades
+        if trade_rows:
+            TradeRepository(db).create_many(trade_rows)
+        cache.set_bot_states_batch(changed_states)
+
+    except Exception as e:
+        logger.error(f"Error ticking trading bots: {e}", exc_info=True)
+    finally:
+        db.close()
         try:
-            bot_repo = TradingBotRepository(db)
-
-            # Periodically verify bot is still active
-            if iteration % db_check_interval == 0:
-                bot = bot_repo.get_active_by_id(bot_id)
-                if not bot:
-                    logger.info(f"Bot {bot_id} is no longer active, stopping task")
-                    cache.delete_bot_state(bot_id)
-                    return
-
-            bot = bot_repo.get_active_by_id(bot_id)
-            if not bot:
-                logger.info(f"Bot {bot_id} not found or inactive, stopping task")
-                cache.delete_bot_state(bot_id)
-                return
-
-            # Read price from Redis
-            price = cache.get_price(bot.symbol)
-            if price is None:
-                if iteration % 30 == 0:
-                    logger.warning(f"Bot {bot_id}: no price in Redis for {bot.symbol}, waiting...")
-                iteration += 1
-                time.sleep(1)
-                continue
-
-            # Run grid trading strategy
-            decisions, state = decide_trade(bot, price, state, previous_price)
-
-            # Record each decision in DB
-            if decisions:
-                trade_repo = TradeRepository(db)
-                for decision in decisions:
-                    trade_repo.create(
-                        trading_bot_id=bot_id,
-                        trade_type=decision["side"],
-                        price=decision["entry_price"],
-                        quantity=decision["quantity"],
-                    )
-
-            # Persist updated state to Redis every tick
-            cache.set_bot_state(bot_id, state)
-
-            previous_price = price
-
-        except Exception as e:
-            logger.error(f"Bot {bot_id}: unexpected error: {e}", exc_info=True)
-        finally:
-            db.close()
-
-        iteration += 1
-        time.sleep(1)
+            cache.release_lock(TICK_LOCK, lock_token)
+        except RedisError as e:
+            # The lock expires on its own after TICK_LOCK_TTL
+            logger.error(f"Cannot release bot tick lock: {e}")
@@ -18,6 +18,11 @@ import signal
 import sys
 from typing import Set
 
+import redis
+import redis.asyncio as aioredis
+
+from app.core.cache import SYMBOLS_CHANGED_CHANNEL
+from app.core.config import settings
 from app.core.db import SessionLocal
 from app.core.logging import setup_logging
 from app.repositories.trading_bot_repo import TradingBotRepository
@@ -34,7 +39,8 @@ class WebSocketWorker:
     def __init__(self):
         self.ws_service = BinanceWebSocketService()
         self.is_running = False
-        self.symbol_refresh_interval = 60  # Refresh symbols every 60 seconds
+        self.symbol_refresh_interval = 300  # Safety refresh if a change notice is missed
+        self.subscribe_retry_delay = 60  # while Redis is down, fall back to the old polling rate
 
     async def refresh_symbols(self) -> Set[str]:
         """Fetch active trading bot symbols from database"""
@@ -50,22 +56,44 @@ class WebSocketWorker:
         finally:
             db.close()
 
+    async def apply_symbols(self):
+        """Reload the active symbols and point the stream filter at them"""
+        symbols = await self.refresh_symbols()
+        if symbols:
+            self.ws_service.set_symbols_to_track(symbols)
+        else:
+            logger.warning("No active trading bots found. WebSocket will cache all symbols.")
+            # Set to None to cache all symbols
+            self.ws_service.set_symbols_to_track(None)
+
     async def periodic_symbol_refresh(self):
-        """Periodically refresh the list of symbols to track"""
-        while self.is_running:
-            try:
-                symbols = await self.refresh_symbols()
-                if symbols:
-                    self.ws_service.set_symbols_to_track(symbols)
-                else:
-                    logger.warning("No active trading bots found. WebSocket will cache all symbols.")
-                    # Set to None to cache all symbols
-                    self.ws_service.set_symbols_to_track(None)
-
-            except Exception as e:
-                logger.error(f"Error in periodic symbol refresh: {e}", exc_info=True)
-
-            await asyncio.sleep(self.symbol_refresh_interval)
+        """Refresh the symbols to track when the API publishes a change.
+
+        Also refreshes every symbol_refresh_interval in case a notice was missed.
+        """
+        client = aioredis.from_url(settings.REDIS_URL, decode_responses=True)
+        pubsub = client.pubsub(ignore_subscribe_messages=True)
+        try:
+            while self.is_running:
+                try:
+                    if not pubsub.subscribed:
+                        await pubsub.subscribe(SYMBOLS_CHANGED_CHANNEL)
+                    # No change notice in the interval still falls through to a refresh
+                    await pubsub.get_message(timeout=self.symbol_refresh_interval)
+                    # A burst of bot edits needs only one reload
+                    while await pubsub.get_message(timeout=0.0) is not None:
+                        pass
+                except redis.RedisError as e:
+                    logger.warning(f"Symbol change subscription error: {e}")
+                    await asyncio.sleep(self.subscribe_retry_delay)
+
+                try:
+                    await self.apply_symbols()
+                except Exception as e:
+                    logger.error(f"Error in periodic symbol refresh: {e}", exc_info=True)
+        finally:
+            await pubsub.aclose()
+            await client.aclose()
 
     async def run(self):
         """Main worker loop"""
@@ -73,11 +101,7 @@ class WebSocketWorker:
         logger.info("Starting Binance WebSocket Worker...")
 
         # Initial symbol load
-        symbols = await self.refresh_symbols()
-        if symbols:
-            self.ws_service.set_symbols_to_track(symbols)
-        else:
-            logger.warning("No active trading bots found. Starting WebSocket anyway (will cache all symbols).")
+        await self.apply_symbols()
 
         # Start both tasks concurrently
         try:
@@ -99,33 +123,29 @@ class WebSocketWorker:
         logger.info("WebSocket Worker stopped")
 
 
-# Global worker instance for signal handling
-worker = None
-
-
-def signal_handler(signum, frame):
-    """Handle shutdown signals gracefully"""
-    logger.info(f"Received signal {signum}. Initiating graceful shutdown...")
-    if worker:
-        asyncio.create_task(worker.stop())
-    sys.exit(0)
+def _request_shutdown(sig: signal.Signals, run_task: asyncio.Task):
+    """Handle shutdown signals gracefully (runs on the event loop)"""
+    logger.info(f"Received signal {sig.name}. Initiating graceful shutdown...")
+    # Cancelling unwinds the WebSocket context manager, which closes the
+    # connection, and run() then finishes with stop()
+    run_task.cancel()
 
 
 async def main():
     """Entry point"""
-    global worker
-
-    # Setup signal handlers for graceful shutdown
-    signal.signal(signal.SIGINT, signal_handler)
-    signal.signal(signal.SIGTERM, signal_handler)
-
     worker = WebSocketWorker()
+    run_task = asyncio.create_task(worker.run())
+
+    # Registered on the loop, so the handler runs between callbacks and can
+    # safely touch tasks (a plain signal.signal handler interrupts arbitrary code)
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, _request_shutdown, sig, run_task)
 
     try:
-        await worker.run()
-    except KeyboardInterrupt:
-        logger.info("Keyboard interrupt received")
-        await worker.stop()
+        await run_task
+    except asyncio.CancelledError:
+        pass
     except Exception as e:
         logger.error(f"Fatal error: {e}", exc_info=True)
         await worker.stop()
@@ -20,6 +20,11 @@ import sys
 import time
 import argparse
 import csv
+import heapq
+import json
+import threading
+import httpx
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
 
 # Set minimal env vars before importing app modules (DB/Redis not needed)
 os.environ.setdefault("APP_ENV", "cli")
@@ -42,10 +47,82 @@ from app.services.parameter_optimizer import (
 )
 from app.services.binance_price_service import BinancePriceService
 
-
-def get_usdc_symbols() -> list[str]:
-    """Fetch all USDC trading pairs from Binance."""
-    return BinancePriceService().get_usdc_symbols()
+FETCH_WORKERS = 8  # concurrent kline downloads; --delay still spaces the requests
+SYMBOLS_CACHE_PATH = os.path.expanduser("~/.cache/jobot/usdc_symbols.json")
+SYMBOLS_CACHE_TTL = 24 * 3600  # seconds
+RESULT_FIELDS = [
+    "symbol", "train_pnl_pct", "test_pnl_pct", "trades", "win_rate", "max_drawdown",
+    "sharpe", "min_price", "max_price", "grid_levels", "sell_pct",
+]
+
+
+def get_usdc_symbols(refresh: bool = False) -> list[str]:
+    """Fetch all USDC trading pairs from Binance.
+
+    The list is kept on disk for SYMBOLS_CACHE_TTL so repeated runs skip the
+    ~2 MB exchangeInfo download. Pass refresh=True to bypass the cache.
+    """
+    try:
+        fresh = time.time() - os.path.getmtime(SYMBOLS_CACHE_PATH) < SYMBOLS_CACHE_TTL
+    except OSError:
+        fresh = False
+    if fresh and not refresh:
+        try:
+            with open(SYMBOLS_CACHE_PATH) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            pass  # unreadable cache: fetch again
+
+    symbols = BinancePriceService().get_usdc_symbols()
+    try:
+        os.makedirs(os.path.dirname(SYMBOLS_CACHE_PATH), exist_ok=True)
+        with open(SYMBOLS_CACHE_PATH, "w") as f:
+            json.dump(symbols, f)
+    except OSError as e:
+        print(f"  Warning: could not cache symbols in {SYMBOLS_CACHE_PATH}: {e}")
+    return symbols
+
+
+class _RateLimiter:
+    """Space calls at least `interval` seconds apart, across threads."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        time.sleep(start - now)
+
+
+def _optimize_symbol(symbol: str, close_prices: list[float], total_amount: float) -> tuple[dict, float]:
+    """Optimize one symbol (runs in a worker process). Returns (result row, seconds)."""
+    t0 = time.time()
+    opt = optimize_parameters(
+        symbol=symbol,
+        close_prices=close_prices,
+        total_amount=total_amount,
+        grid_levels_options=SCREENING_GRID_LEVELS,
+        sell_percentage_options=SCREENING_SELL_PERCENTAGES,
+    )
+    r = {
+        "symbol": symbol,
+        "train_pnl_pct": opt.best_params.total_pnl_pct,
+        "test_pnl_pct": opt.test_result.total_pnl_pct,
+        "trades": opt.best_params.num_trades,
+        "win_rate": opt.best_params.win_rate,
+        "max_drawdown": opt.best_params.max_drawdown,
+        "sharpe": opt.best_params.sharpe_ratio,
+        "min_price": opt.best_params.min_price,
+        "max_price": opt.best_params.max_price,
+        "grid_levels": opt.best_params.grid_levels,
+        "sell_pct": opt.best_params.sell_percentage,
+    }
+    return r, time.time() - t0
 
 
 def run_screening(
@@ -56,76 +133,120 @@ def run_screening(
     delay: float,
     source: str = "api",
     days: int = 7,
-) -> list[dict]:
-    """Run optimization on each symbol and return results."""
-    results = []
+    workers: int | None = None,
+    top_n: int = 50,
+    csv_writer: csv.DictWriter | None = None,
+) -> tuple[list[dict], int]:
+    """Run optimization on each symbol.
+
+    Klines are downloaded by a thread pool (rate limited by `delay`) while
+    already-fetched symbols are optimized in `workers` processes, so network
+    waits overlap with the CPU-bound backtests. At most 2 * `workers` symbols
+    are fetched or queued for optimization at a time, so memory tracks the
+    pool size rather than the number of symbols.
+
+    Each result is written to `csv_writer` as soon as it completes, and only
+    the best `top_n` are kept in memory.
+
+    Returns:
+        (top_n results ranked by test P&L%, number of symbols completed)
+    """
+    top = []  # min-heap of (test_pnl_pct, completion order, result)
+    completed = 0
     total = len(symbols)
+    done = 0
+    limiter = _RateLimiter(delay)
 
-    for i, symbol in enumerate(symbols, 1):
-        progress = f"[{i}/{total}]"
-        try:
-            if source == "vision":
-                klines = fetch_klines_vision(
-                    symbol=symbol, interval=interval, days=days,
+    # One keep-alive connection per fetch thread instead of a TLS handshake per symbol
+    http = httpx.Client(
+        timeout=15.0,
+        limits=httpx.Limits(max_connections=FETCH_WORKERS, max_keepalive_connections=FETCH_WORKERS),
+    )
+
+    def fetch(symbol: str):
+        limiter.wait()
+        if source == "vision":
+            return fetch_klines_vision(symbol=symbol, interval=interval, days=days)
+        return fetch_klines(symbol=symbol, interval=interval, limit=limit, client=http)
+
+    with http, ThreadPoolExecutor(max_workers=FETCH_WORKERS) as fetch_pool, \
+            ProcessPoolExecutor(max_workers=workers) as optimize_pool:
+        # Bound the klines held in memory: a fetch is only started while fewer
+        # than 2 * workers symbols are downloading or waiting to be optimized
+        max_in_flight = 2 * (workers or os.cpu_count() or 1)
+        queued = iter(symbols)
+        fetches = {}
+        optimizations = {}
+        pending = set()
+
+        def refill():
+            while len(fetches) + len(optimizations) < max_in_flight:
+                symbol = next(queued, None)
+                if symbol is None:
+                    return
+                future = fetch_pool.submit(fetch, symbol)
+                fetches[future] = symbol
+                pending.add(future)
+
+        refill()
+        while pending:
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                if future in fetches:
+                    symbol = fetches.pop(future)
+                    try:
+                        klines = future.result()
+                    except Exception as e:
+                        done += 1
+                        print(f"  [{done}/{total}] {symbol:<15} ERROR: {e}")
+                        continue
+
+                    if len(klines) < 200:
+                        done += 1
+                        print(f"  [{done}/{total}] {symbol:<15} skipped ({len(klines)} candles)")
+                        continue
+
+                    job = optimize_pool.submit(_optimize_symbol, symbol, klines.close.tolist(), total_amount)
+                    optimizations[job] = (symbol, len(klines))
+                    pending.add(job)
+                    continue
+
+                symbol, n_candles = optimizations.pop(future)
+                done += 1
+                progress = f"[{done}/{total}]"
+                try:
+                    r, elapsed = future.result()
+                except Exception as e:
+                    print(f"  {progress} {symbol:<15} ERROR: {e}")
+                    continue
+                completed += 1
+                if csv_writer is not None:
+                    csv_writer.writerow(r)
+                entry = (r["test_pnl_pct"], completed, r)
+                if len(top) < top_n:
+                    heapq.heappush(top, entry)
+                else:
+                    heapq.heappushpop(top, entry)
+
+                color = "\033[32m" if r["test_pnl_pct"] > 0 else "\033[31m"
+                reset = "\033[0m"
+                candle_info = f"{n_candles:>7} candles  " if source == "vision" else ""
+                print(
+                    f"  {progress} {symbol:<15} {candle_info}"
+                    f"train: {r['train_pnl_pct']:+7.2f}%  "
+                    f"test: {color}{r['test_pnl_pct']:+7.2f}%{reset}  "
+                    f"trades: {r['trades']:>4}  "
+                    f"win: {r['win_rate']*100:5.1f}%  "
+                    f"({elapsed:.1f}s)"
                 )
-            else:
-                klines = fetch_klines(symbol=symbol, interval=interval, limit=limit)
-
-            if len(klines) < 200:
-                print(f"  {progress} {symbol:<15} skipped ({len(klines)} candles)")
-                time.sleep(delay)
-                continue
-
-            close_prices = [k["close"] for k in klines]
-
-            t0 = time.time()
-            opt = optimize_parameters(
-                symbol=symbol,
-                close_prices=close_prices,
-                total_amount=total_amount,
-                grid_levels_options=SCREENING_GRID_LEVELS,
-                sell_percentage_options=SCREENING_SELL_PERCENTAGES,
-            )
-            elapsed = time.time() - t0
-
-            r = {
-                "symbol": symbol,
-                "train_pnl_pct": opt.best_params.total_pnl_pct,
-                "test_pnl_pct": opt.test_result.total_pnl_pct,
-                "trades": opt.best_params.num_trades,
-                "win_rate": opt.best_params.win_rate,
-                "max_drawdown": opt.best_params.max_drawdown,
-                "sharpe": opt.best_params.sharpe_ratio,
-                "min_price": opt.best_params.min_price,
-                "max_price": opt.best_params.max_price,
-                "grid_levels": opt.best_params.grid_levels,
-                "sell_pct": opt.best_params.sell_percentage,
-            }
-            results.append(r)
-
-            color = "\033[32m" if r["test_pnl_pct"] > 0 else "\033[31m"
-            reset = "\033[0m"
-            candle_info = f"{len(klines):>7} candles  " if source == "vision" else ""
-            print(
-                f"  {progress} {symbol:<15} {candle_info}"
-                f"train: {r['train_pnl_pct']:+7.2f}%  "
-                f"test: {color}{r['test_pnl_pct']:+7.2f}%{reset}  "
-                f"trades: {r['trades']:>4}  "
-                f"win: {r['win_rate']*100:5.1f}%  "
-                f"({elapsed:.1f}s)"
-            )
-
-        except Exception as e:
-            print(f"  {progress} {symbol:<15} ERROR: {e}")
-
-        time.sleep(delay)
-
-    return results
-
-
-def print_results(results: list[dict], top_n: int):
+            refill()
+
+    ranked = [r for _, _, r in sorted(top, reverse=True)]
+    return ranked, completed
+
+
+def print_results(ranked: list[dict]):
     """Print ranked results table."""
-    ranked = sorted(results, key=lambda r: r["test_pnl_pct"], reverse=True)[:top_n]
 
     print("\n" + "=" * 110)
     print(f"  TOP {len(ranked)} RESULTS (ranked by test P&L%)")
@@ -157,20 +278,6 @@ def print_results(results: list[dict], top_n: int):
     print("=" * 110)
 
 
-def save_csv(results: list[dict], path: str):
-    """Export results to CSV."""
-    ranked = sorted(results, key=lambda r: r["test_pnl_pct"], reverse=True)
-    if not ranked:
-        return
-
-    with open(path, "w", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=ranked[0].keys())
-        writer.writeheader()
-        writer.writerows(ranked)
-
-    print(f"\nResults saved to {path}")
-
-
 def main():
     parser = argparse.ArgumentParser(description="Jobot Market Screening CLI")
     parser.add_argument("--source", choices=["api", "vision"], default="api",
@@ -181,8 +288,11 @@ def main():
     parser.add_argument("--amount", type=float, default=1000.0, help="Simulated budget in USDC (default: 1000)")
     parser.add_argument("--top", type=int, default=50, help="Show top N results (default: 50)")
     parser.add_argument("--delay", type=float, default=0.3, help="Delay between API calls in seconds (default: 0.3)")
+    parser.add_argument("--workers", type=int, default=None, help="Optimization processes (default: CPU count)")
     parser.add_argument("--symbol", type=str, default=None, help="Test a single symbol (e.g., BTCUSDC)")
     parser.add_argument("--csv", type=str, default=None, help="Export results to CSV file")
+    parser.add_argument("--refresh-symbols", action="store_true",
+                        help="Re-download the USDC pair list instead of using the 24h disk cache")
     args = parser.parse_args()
 
     print(f"\nJobot Market Screening")
@@ -197,23 +307,36 @@ def main():
         print(f"  Single symbol mode: {symbols[0]}")
     else:
         print("  Fetching USDC symbols from Binance...")
-        symbols = get_usdc_symbols()
+        symbols = get_usdc_symbols(refresh=args.refresh_symbols)
         print(f"  Found {len(symbols)} USDC pairs\n")
 
-    t_start = time.time()
-    results = run_screening(
-        symbols, args.interval, args.limit, args.amount, args.delay,
-        source=args.source, days=args.days,
-    )
-    elapsed = time.time() - t_start
+    # Rows are written as symbols complete (line buffered), so an interrupted
+    # run keeps everything screened so far
+    csv_file = open(args.csv, "w", newline="", buffering=1) if args.csv else None
+    try:
+        csv_writer = None
+        if csv_file:
+            csv_writer = csv.DictWriter(csv_file, fieldnames=RESULT_FIELDS)
+            csv_writer.writeheader()
+
+        t_start = time.time()
+        ranked, completed = run_screening(
+            symbols, args.interval, args.limit, args.amount, args.delay,
+            source=args.source, days=args.days, workers=args.workers,
+            top_n=args.top, csv_writer=csv_writer,
+        )
+        elapsed = time.time() - t_start
+    finally:
+        if csv_file:
+            csv_file.close()
 
-    print(f"\n  Completed: {len(results)}/{len(symbols)} symbols in {elapsed:.0f}s")
+    print(f"\n  Completed: {completed}/{len(symbols)} symbols in {elapsed:.0f}s")
 
-    if results:
-        print_results(results, args.top)
+    if ranked:
+        print_results(ranked)
 
     if args.csv:
-        save_csv(results, args.csv)
+        print(f"\nResults saved to {args.csv}")
 
 
 if __name__ == "__main__":
@@ -1,8 +1,9 @@
 import os
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 
 # Force sqlite for tests
 os.environ["DB_URL_OVERRIDE"] = "sqlite+pysqlite:///:memory:"
@@ -12,22 +13,64 @@ os.environ["JWT_SECRET"] = os.environ.get("JWT_SECRET", "test_secret_change_me")
 from app.main import create_app
 from app.core.db import Base
 from app.core.db import get_db as get_db_dep
+from app.api.routes.auth import limiter as auth_limiter
+
+@pytest.fixture(scope="session")
+def engine():
+    """One in-memory database for the whole run; tables are created once.
+
+    StaticPool hands every checkout the same connection, so code running on the
+    TestClient's thread sees the same database instead of a fresh empty one.
+    """
+    engine = create_engine(
+        "sqlite+pysqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+
+    # Let SQLAlchemy emit BEGIN itself so SAVEPOINTs work with pysqlite
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_begin(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
 
-@pytest.fixture()
-def db_session():
-    engine = create_engine("sqlite+pysqlite:///:memory:", connect_args={"check_same_thread": False})
-    TestingSessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
     Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+@pytest.fixture()
+def db_session(engine):
+    """Session inside a per-test transaction; repository commits become savepoints
+    and everything is rolled back after the test."""
+    connection = engine.connect()
+    transaction = connection.begin()
+    TestingSessionLocal = sessionmaker(
+        bind=connection, autoflush=False, autocommit=False,
+        join_transaction_mode="create_savepoint",
+    )
     db = TestingSessionLocal()
     try:
         yield db
     finally:
         db.close()
+        transaction.rollback()
+        connection.close()
 
-@pytest.fixture()
-def client(db_session):
-    app = create_app()
+@pytest.fixture(scope="session")
+def app():
+    """The app (migrations, routers, middleware) is built once; tests only swap the DB."""
+    return create_app()
 
+@pytest.fixture(scope="session")
+def session_client(app):
+    return TestClient(app)
+
+@pytest.fixture()
+def client(app, session_client, db_session):
+    """The shared TestClient, bound to this test's rolled-back session."""
     def override_get_db():
         try:
             yield db_session
@@ -35,10 +78,26 @@ def client(db_session):
             pass
 
     app.dependency_overrides[get_db_dep] = override_get_db
-    return TestClient(app)
+    session_client.cookies.clear()
+    # Login/register limits live in process memory; don't carry them across tests
+    auth_limiter.reset()
+    try:
+        yield session_client
+    finally:
+        app.dependency_overrides.pop(get_db_dep, None)
 
 def register_user(client: TestClient, email: str, password: str):
     return client.post("/auth/register", json={"email": email, "password": password})
 
 def login_user(client: TestClient, email: str, password: str):
     return client.post("/auth/login", json={"email": email, "password": password})
+
+def verified_user_headers(client: TestClient, db_session, email: str, password: str = "Password123!"):
+    """Register a user, mark the email verified (login requires it) and return auth headers."""
+    from app.models.user import User
+    register_user(client, email, password)
+    user = db_session.query(User).filter(User.email == email).first()
+    user.is_verified = 1
+    db_session.commit()
+    token = login_user(client, email, password).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
@@ -5,8 +5,12 @@ os.environ["DB_URL_OVERRIDE"] = "sqlite+pysqlite:///:memory:"
 os.environ["APP_ENV"] = "test"
 os.environ["JWT_SECRET"] = os.environ.get("JWT_SECRET", "test_secret_change_me")
 
+import math
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
-from app.services.backtest_engine import run_backtest
+from app.services.backtest_engine import run_backtest, run_backtest_sweep
+from app.services.parameter_optimizer import optimize_parameters
 
 
 class TestBacktestBasic:
@@ -26,6 +30,24 @@ class TestBacktestBasic:
         assert result.num_trades == 0
         assert result.total_pnl == 0.0
 
+    def test_out_of_range_matches_full_replay(self):
+        """Prices that never enter the range report the same zero metrics a replay would."""
+        result = run_backtest(
+            symbol="TESTUSDC",
+            close_prices=[60.0, 80.0, 70.0, 90.0],
+            min_price=100.0,
+            max_price=150.0,
+            total_amount=1000.0,
+            sell_percentage=2.0,
+            grid_levels=10,
+        )
+        assert result.num_trades == 0
+        assert result.max_drawdown == 0.0
+        assert result.sharpe_ratio == 0.0
+        assert result.final_open_positions == 0
+        assert result.min_price == 100.0
+        assert result.grid_levels == 10
+
     def test_first_buy_when_price_in_range(self):
         """Price enters range -> at least one buy."""
         result = run_backtest(
@@ -215,3 +237,37 @@ class TestBacktestFullScenario:
         )
         assert result.num_buys == 2
         assert result.num_sells == 1
+
+
+class TestBacktestSweep:
+    """Parameter sweep tests."""
+
+    def test_sweep_runs_every_row_in_order(self):
+        """A 4x4 sweep returns one result per row, matching single runs."""
+        prices = [100.0 + 10.0 * math.sin(i / 10.0) for i in range(300)]
+        rows = [
+            {"min_price": 85.0, "max_price": 115.0, "grid_levels": gl, "sell_percentage": sp}
+            for gl in (3, 5, 10, 15)
+            for sp in (0.5, 1.0, 2.0, 3.0)
+        ]
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = run_backtest_sweep("TESTUSDC", prices, 1000.0, rows, executor=executor)
+        assert len(results) == 16
+        assert [(r.grid_levels, r.sell_percentage) for r in results] == [
+            (row["grid_levels"], row["sell_percentage"]) for row in rows
+        ]
+        assert results[5] == run_backtest(symbol="TESTUSDC", close_prices=prices, total_amount=1000.0, **rows[5])
+
+
+class TestOptimizeParameters:
+    """Grid-search optimizer tests."""
+
+    def test_executor_matches_inline_run(self):
+        """Spreading combinations over an executor gives the same ranking."""
+        prices = [100.0 + 10.0 * math.sin(i / 15.0) for i in range(600)]
+        inline = optimize_parameters("TESTUSDC", prices)
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            pooled = optimize_parameters("TESTUSDC", prices, executor=executor)
+        assert pooled.all_results == inline.all_results
+        assert pooled.best_params == inline.best_params
+        assert pooled.test_result == inline.test_result
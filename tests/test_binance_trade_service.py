@@ -0,0 +1,64 @@
+from collections import OrderedDict
+from types import SimpleNamespace
+
+import pytest
+
+import app.services.binance_trade_service as trade_module
+from app.core.encryption import encrypt
+from app.services.binance_trade_service import get_trade_service
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    monkeypatch.setattr(trade_module, "_trade_services", OrderedDict())
+
+
+def make_user(user_id, key="key", secret="secret"):
+    return SimpleNamespace(id=user_id, binance_api_key=encrypt(key), binance_api_secret=encrypt(secret))
+
+
+def test_reuses_service_for_same_keys(monkeypatch):
+    decrypted = []
+    decrypt = trade_module.decrypt
+    monkeypatch.setattr(trade_module, "decrypt", lambda c: decrypted.append(c) or decrypt(c))
+    user = make_user(1)
+
+    first = get_trade_service(user)
+    second = get_trade_service(user)
+
+    assert second is first
+    assert len(decrypted) == 2  # key and secret, once
+    assert (first.api_key, first.api_secret) == ("key", "secret")
+
+
+def test_rebuilds_service_when_keys_change_without_closing_old():
+    user = make_user(1)
+    old = get_trade_service(user)
+
+    user.binance_api_key = encrypt("new-key")
+    user.binance_api_secret = encrypt("new-secret")
+    new = get_trade_service(user)
+
+    assert new is not old
+    assert (new.api_key, new.api_secret) == ("new-key", "new-secret")
+    # Another request may still be using the old client
+    assert not old.client.is_closed
+
+
+def test_evicts_least_recently_used(monkeypatch):
+    monkeypatch.setattr(trade_module, "TRADE_SERVICE_CACHE_SIZE", 2)
+    users = [make_user(i) for i in (1, 2, 3)]
+    first = get_trade_service(users[0])
+    get_trade_service(users[1])
+    get_trade_service(users[0])  # user 2 is now least recently used
+    get_trade_service(users[2])
+
+    assert list(trade_module._trade_services) == [1, 3]
+    assert get_trade_service(users[0]) is first
+
+
+def test_expired_entry_is_rebuilt(monkeypatch):
+    monkeypatch.setattr(trade_module, "TRADE_SERVICE_TTL", 0.0)
+    user = make_user(1)
+
+    assert get_trade_service(user) is not get_trade_service(user)
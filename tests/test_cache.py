@@ -0,0 +1,42 @@
+import orjson
+import pytest
+
+import app.core.cache as cache_module
+from app.core.cache import RedisCache
+
+
+class RecordingClient:
+    """Collects SETEX writes, directly or through a pipeline."""
+
+    def __init__(self):
+        self.writes = {}
+
+    def setex(self, key, ttl, value):
+        self.writes[key] = (ttl, value)
+
+    def pipeline(self, transaction=True):
+        return self
+
+    def execute(self):
+        return []
+
+
+@pytest.fixture()
+def redis_client(monkeypatch):
+    client = RecordingClient()
+    monkeypatch.setattr(cache_module, "_client", client)
+    monkeypatch.setattr(cache_module.time, "time", lambda: 1700000000.25)
+    return client
+
+
+def test_set_prices_batch_writes_same_json_as_set_price(redis_client):
+    cache = RedisCache()
+    cache.set_price("btcusdc", 43210.5, ttl=7)
+    single = redis_client.writes.pop("price:BTCUSDC")
+
+    cache.set_prices_batch({"btcusdc": 43210.5, "ETHUSDC": 2345.0}, ttl=7)
+
+    assert redis_client.writes["price:BTCUSDC"] == single
+    ttl, value = redis_client.writes["price:ETHUSDC"]
+    assert ttl == 7
+    assert orjson.loads(value) == {"price": 2345.0, "timestamp": 1700000000.25, "source": "binance"}
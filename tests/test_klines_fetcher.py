@@ -0,0 +1,106 @@
+"""Unit tests for the column-wise Klines container and kline page stitching."""
+
+import os
+os.environ["DB_URL_OVERRIDE"] = "sqlite+pysqlite:///:memory:"
+os.environ["APP_ENV"] = "test"
+os.environ["JWT_SECRET"] = os.environ.get("JWT_SECRET", "test_secret_change_me")
+
+from app.services.klines_fetcher import Klines, fetch_klines
+
+
+def make_rows(n, start=0):
+    """Raw Binance rows: [open_time, open, high, low, close, volume, close_time, ...] as strings."""
+    return [
+        [1_000 * i, f"{i + 0.1}", f"{i + 0.2}", f"{i + 0.3}", f"{i + 0.4}", f"{i + 0.5}", 1_000 * i + 999, "0"]
+        for i in range(start, start + n)
+    ]
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.data
+
+
+class FakeKlinesClient:
+    """Serves the newest `limit` rows before endTime, like /api/v3/klines."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.requests = []
+
+    def get(self, url, params):
+        self.requests.append(dict(params))
+        end = params.get("endTime")
+        rows = [r for r in self.rows if end is None or r[0] <= end]
+        return FakeResponse(rows[-params["limit"]:])
+
+
+class TestKlines:
+    def test_from_rows_keeps_column_order(self):
+        klines = Klines.from_rows(make_rows(3))
+        assert len(klines) == 3
+        assert list(klines.time) == [0, 1_000, 2_000]
+        assert list(klines.open) == [0.1, 1.1, 2.1]
+        assert list(klines.high) == [0.2, 1.2, 2.2]
+        assert list(klines.low) == [0.3, 1.3, 2.3]
+        assert list(klines.close) == [0.4, 1.4, 2.4]
+        assert list(klines.volume) == [0.5, 1.5, 2.5]
+
+    def test_to_records_round_trip(self):
+        rows = make_rows(4, start=10)
+        records = Klines.from_rows(rows).to_records()
+        assert records == [
+            {
+                "time": r[0], "open": float(r[1]), "high": float(r[2]),
+                "low": float(r[3]), "close": float(r[4]), "volume": float(r[5]),
+            }
+            for r in rows
+        ]
+
+    def test_append_matches_from_rows(self):
+        rows = make_rows(2)
+        built = Klines()
+        for r in rows:
+            built.append(r[0], *(float(v) for v in r[1:6]))
+        assert built == Klines.from_rows(rows)
+
+    def test_empty(self):
+        assert len(Klines.from_rows([])) == 0
+        assert Klines().to_records() == []
+
+
+class TestFetchKlines:
+    def test_two_pages_stitched_oldest_first(self):
+        client = FakeKlinesClient(make_rows(1500))
+
+        klines = fetch_klines("btcusdt", "1h", limit=1500, client=client)
+
+        # Second page ends just before the oldest candle of the first (rows 500..1499)
+        assert [r.get("endTime") for r in client.requests] == [None, 500_000 - 1]
+        assert [r["limit"] for r in client.requests] == [1000, 500]
+        assert len(klines) == 1500
+        assert list(klines.time) == [1_000 * i for i in range(1500)]
+        assert klines.close[0] == 0.4
+        assert klines.close[-1] == 1499.4
+
+    def test_short_history_stops_after_partial_page(self):
+        client = FakeKlinesClient(make_rows(300))
+
+        klines = fetch_klines("BTCUSDT", "1h", limit=2000, client=client)
+
+        assert len(client.requests) == 1
+        assert list(klines.time) == [1_000 * i for i in range(300)]
+
+    def test_keeps_the_most_recent_limit(self):
+        client = FakeKlinesClient(make_rows(1500))
+
+        klines = fetch_klines("BTCUSDT", "1h", limit=1200, client=client)
+
+        assert [r["limit"] for r in client.requests] == [1000, 200]
+        assert list(klines.time) == [1_000 * i for i in range(300, 1500)]
@@ -21,9 +21,74 @@ def test_portfolio_crud(client, monkeypatch):
 
     # Mock price fetch for valuation
     from app.services.binance_price_service import BinancePriceService
+    from app.core.cache import RedisCache
+    monkeypatch.setattr(RedisCache, "get_prices_batch", lambda self, symbols: {})
+    monkeypatch.setattr(BinancePriceService, "get_prices_batch", lambda self, symbols: {"BTCUSDT": 40000.0})
     monkeypatch.setattr(BinancePriceService, "get_price", lambda self, symbol: 40000.0)
 
     r = client.get("/portfolio/valuation", headers=auth_headers(tok))
     assert r.status_code == 200
     val = r.json()
     assert val["total_value"] == 40000.0 * 0.5
+
+
+class FakePriceCache:
+    def __init__(self, prices=None, error=None):
+        self.prices = prices or {}
+        self.error = error
+
+    def get_prices_batch(self, symbols):
+        if self.error:
+            raise self.error
+        return {s.upper(): self.prices[s.upper()] for s in symbols if s.upper() in self.prices}
+
+
+class FakeBinancePrices:
+    def __init__(self, prices):
+        self.prices = prices
+        self.batches = []
+
+    def get_prices_batch(self, symbols):
+        self.batches.append(sorted(symbols))
+        return {s.upper(): self.prices[s.upper()] for s in symbols}
+
+    def get_price(self, symbol):
+        raise AssertionError("every price should come from a batch")
+
+
+def portfolio_user(db_session):
+    from app.models.user import User
+    user = User(email="valuation@test.com", password_hash="x", role="user", is_verified=1)
+    db_session.add(user)
+    db_session.commit()
+    return user
+
+
+def test_valuation_fetches_only_cache_misses_from_binance(db_session):
+    from app.services.portfolio_service import PortfolioService
+    user = portfolio_user(db_session)
+    binance = FakeBinancePrices({"ETHUSDT": 2000.0, "SOLUSDT": 100.0})
+    service = PortfolioService(db_session, price_service=binance, cache=FakePriceCache({"BTCUSDT": 40000.0}))
+    for symbol, qty in [("BTCUSDT", 0.5), ("ETHUSDT", 2.0), ("SOLUSDT", 10.0)]:
+        service.upsert_asset(user.id, symbol, qty)
+
+    val = service.get_valuation(user.id)
+
+    assert binance.batches == [["ETHUSDT", "SOLUSDT"]]
+    assert val["total_value"] == 40000.0 * 0.5 + 2000.0 * 2.0 + 100.0 * 10.0
+
+
+def test_valuation_falls_back_to_binance_when_redis_fails(db_session):
+    import redis
+    from app.services.portfolio_service import PortfolioService
+    user = portfolio_user(db_session)
+    binance = FakeBinancePrices({"BTCUSDT": 40000.0, "ETHUSDT": 2000.0})
+    cache = FakePriceCache({"BTCUSDT": 1.0}, error=redis.ConnectionError("redis down"))
+    service = PortfolioService(db_session, price_service=binance, cache=cache)
+    service.upsert_asset(user.id, "BTCUSDT", 0.5)
+    service.upsert_asset(user.id, "ETHUSDT", 2.0)
+
+    val = service.get_valuation(user.id)
+
+    assert binance.batches == [["BTCUSDT", "ETHUSDT"]]
+    assert {i["symbol"]: i["price"] for i in val["items"]} == {"BTCUSDT": 40000.0, "ETHUSDT": 2000.0}
@@ -0,0 +1,214 @@
+from types import SimpleNamespace
+
+import orjson
+import pytest
+
+import app.core.cache as cache_module
+import app.workers.screening_tasks as screening_tasks
+from app.models.screening_result import ScreeningResult
+from app.models.user import User
+from app.services.klines_fetcher import Klines
+from app.workers.celery_app import celery
+from tests.conftest import verified_user_headers
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.calls = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+            return self
+        return queue
+
+    def execute(self):
+        return [getattr(self.client, name)(*args, **kwargs) for name, args, kwargs in self.calls]
+
+
+class FakeRedis:
+    """Dict-backed stand-in for the redis client, with the commands screening uses."""
+
+    def __init__(self):
+        self.data = {}
+        self.zsets = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def mget(self, *keys):
+        if len(keys) == 1 and isinstance(keys[0], list):
+            keys = keys[0]
+        return [self.data.get(k) for k in keys]
+
+    def setex(self, key, ttl, value):
+        self.data[key] = value
+
+    def incr(self, key):
+        self.data[key] = int(self.data.get(key, 0)) + 1
+        return self.data[key]
+
+    def expire(self, key, ttl):
+        return True
+
+    def zadd(self, key, mapping):
+        self.zsets.setdefault(key, {}).update(mapping)
+
+    def zrevrange(self, key, start, end):
+        members = sorted(self.zsets.get(key, {}).items(), key=lambda m: m[1], reverse=True)
+        return [m for m, _ in members[start:end + 1]]
+
+    def delete(self, *keys):
+        for k in keys:
+            self.data.pop(k, None)
+            self.zsets.pop(k, None)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def eval(self, script, numkeys, *args):
+        return "0"  # every rate limit token is granted
+
+
+PNL_BY_SYMBOL = {"AAAUSDC": 5.0, "BBBUSDC": 12.0, "CCCUSDC": -3.0, "DDDUSDC": 8.0}
+
+
+def fake_fetch_klines(symbol, interval, limit):
+    if symbol == "FAILUSDC":
+        raise RuntimeError("Binance unavailable")
+    rows = 50 if symbol == "SHORTUSDC" else 200
+    return Klines.from_rows([[i, 1.0, 1.0, 1.0, 1.0 + i, 1.0] for i in range(rows)])
+
+
+def fake_optimize_parameters(symbol, close_prices, total_amount, **kwargs):
+    pnl = PNL_BY_SYMBOL[symbol]
+    best = SimpleNamespace(
+        total_pnl_pct=pnl, min_price=1.0, max_price=2.0, grid_levels=5, sell_percentage=1.0,
+        num_trades=4, win_rate=0.5, max_drawdown=0.1, sharpe_ratio=1.0,
+    )
+    return SimpleNamespace(best_params=best, test_result=SimpleNamespace(total_pnl_pct=pnl / 2, win_rate=0.5))
+
+
+@pytest.fixture()
+def redis_client(monkeypatch):
+    client = FakeRedis()
+    monkeypatch.setattr(cache_module, "_client", client)
+    return client
+
+
+@pytest.fixture()
+def screening(db_session, redis_client, monkeypatch):
+    """Run the screening chord eagerly against the test session and fake Redis."""
+    monkeypatch.setattr(celery.conf, "task_always_eager", True)
+    monkeypatch.setattr(screening_tasks, "SessionLocal", lambda: db_session)
+    monkeypatch.setattr(screening_tasks, "fetch_klines", fake_fetch_klines)
+    monkeypatch.setattr(screening_tasks, "optimize_parameters", fake_optimize_parameters)
+
+    user = User(email="screen@test.com", password_hash="x", role="user", is_verified=1)
+    db_session.add(user)
+    db_session.commit()
+
+    def run(symbols, task_id="screen-1"):
+        redis_client.setex("symbols:USDC", 3600, orjson.dumps(symbols))
+        screening_tasks.run_screening.apply(args=(user.id,), task_id=task_id)
+        return orjson.loads(redis_client.get(f"screening:{task_id}"))
+
+    run.user_id = user.id
+    return run
+
+
+def test_screening_merges_results_and_keeps_top(screening, db_session, redis_client, monkeypatch):
+    monkeypatch.setattr(screening_tasks, "TOP_RESULTS", 2)
+    symbols = ["AAAUSDC", "BBBUSDC", "FAILUSDC", "CCCUSDC", "SHORTUSDC", "DDDUSDC"]
+
+    progress = screening(symbols)
+
+    assert progress["status"] == "completed"
+    assert progress["processed_symbols"] == len(symbols)
+    assert progress["progress"] == 100
+    assert [r["symbol"] for r in progress["results"]] == ["BBBUSDC", "DDDUSDC"]
+    # The per-symbol counters are dropped once the final blob is written
+    assert "screening:screen-1:processed" not in redis_client.data
+    assert "screening:screen-1:results" not in redis_client.zsets
+
+
+def test_screening_saves_every_result(screening, db_session):
+    user_id = screening.user_id
+    screening(["AAAUSDC", "FAILUSDC", "BBBUSDC", "SHORTUSDC"])
+
+    rows = db_session.query(ScreeningResult).filter(ScreeningResult.task_id == "screen-1").all()
+    assert sorted(r.symbol for r in rows) == ["AAAUSDC", "BBBUSDC"]
+    assert {r.user_id for r in rows} == {user_id}
+    assert {r.symbol: r.test_pnl_pct for r in rows} == {"AAAUSDC": 2.5, "BBBUSDC": 6.0}
+
+
+def test_screening_without_symbols_completes_empty(screening, db_session, monkeypatch):
+    # An empty cached list is a miss, so the symbols come from Binance
+    monkeypatch.setattr(screening_tasks.BinancePriceService, "get_usdc_symbols", lambda self: [])
+    progress = screening([])
+
+    assert progress["status"] == "completed"
+    assert progress["results"] == []
+    assert db_session.query(ScreeningResult).count() == 0
+
+
+def test_screen_symbol_waits_for_rate_limit(redis_client, monkeypatch):
+    waits = iter([0.5, 0.25, 0.0])
+    slept = []
+    monkeypatch.setattr(cache_module.RedisCache, "take_rate_token", lambda self, name, per_minute, burst: next(waits))
+    monkeypatch.setattr(screening_tasks.time, "sleep", slept.append)
+    monkeypatch.setattr(screening_tasks, "fetch_klines", fake_fetch_klines)
+    monkeypatch.setattr(screening_tasks, "optimize_parameters", fake_optimize_parameters)
+
+    result = screening_tasks.screen_symbol("screen-2", "AAAUSDC", "1h", 200, 1000.0, 1, "now")
+
+    assert slept == [0.5, 0.25]
+    assert result["best_pnl_pct"] == 5.0
+
+
+def test_status_mid_run_counts_ahead_of_flushed_results(client, db_session, redis_client, monkeypatch):
+    monkeypatch.setattr(screening_tasks, "RESULTS_FLUSH_EVERY", 2)
+    monkeypatch.setattr(screening_tasks, "fetch_klines", fake_fetch_klines)
+    monkeypatch.setattr(screening_tasks, "optimize_parameters", fake_optimize_parameters)
+    headers = verified_user_headers(client, db_session, "status@test.com")
+    cache = cache_module.RedisCache()
+    screening_tasks._write_progress(cache, "screen-3", 4, "2026-01-01T00:00:00", 0, [])
+
+    for symbol in ["AAAUSDC", "BBBUSDC", "DDDUSDC"]:
+        screening_tasks.screen_symbol("screen-3", symbol, "1h", 200, 1000.0, 4, "2026-01-01T00:00:00")
+
+    r = client.get("/simulation/screening/screen-3", headers=headers)
+    assert r.status_code == 200
+    status = r.json()
+    assert status["status"] == "running"
+    # Live count from the per-symbol counter; results as of the last flush (2 symbols)
+    assert status["processed_symbols"] == 3
+    assert status["progress"] == 75
+    assert [res["symbol"] for res in status["results"]] == ["BBBUSDC", "AAAUSDC"]
+    assert status["completed_at"] is None
+
+
+def test_status_after_finish_reports_final_results(client, db_session, redis_client, monkeypatch):
+    monkeypatch.setattr(screening_tasks, "SessionLocal", lambda: db_session)
+    monkeypatch.setattr(screening_tasks, "fetch_klines", fake_fetch_klines)
+    monkeypatch.setattr(screening_tasks, "optimize_parameters", fake_optimize_parameters)
+    headers = verified_user_headers(client, db_session, "status@test.com")
+    user_id = db_session.query(User).filter(User.email == "status@test.com").first().id
+    cache = cache_module.RedisCache()
+    screening_tasks._write_progress(cache, "screen-4", 3, "2026-01-01T00:00:00", 0, [])
+
+    results = [
+        screening_tasks.screen_symbol("screen-4", symbol, "1h", 200, 1000.0, 3, "2026-01-01T00:00:00")
+        for symbol in ["AAAUSDC", "FAILUSDC", "BBBUSDC"]
+    ]
+    screening_tasks.finish_screening(results, "screen-4", user_id, 3, "2026-01-01T00:00:00")
+
+    r = client.get("/simulation/screening/screen-4", headers=headers)
+    assert r.status_code == 200
+    status = r.json()
+    assert status["status"] == "completed"
+    assert status["processed_symbols"] == 3
+    assert status["progress"] == 100
+    assert [res["symbol"] for res in status["results"]] == ["BBBUSDC", "AAAUSDC"]
+    assert status["completed_at"] is not None
@@ -0,0 +1,164 @@
+from collections import OrderedDict
+
+import pytest
+
+import app.services.binance_trade_service as trade_module
+from app.core.cache import RedisCache
+from app.core.config import settings
+from app.core.encryption import encrypt
+from app.models.trading_bot import TradingBot
+from app.models.user import User
+from app.repositories.trade_repo import TradeRepository
+from app.repositories.trading_bot_repo import TradingBotRepository
+from app.services.binance_trade_service import BinanceTradeService
+from tests.conftest import verified_user_headers
+
+BOT = {
+    "symbol": "SOLUSDC",
+    "max_price": 200.0,
+    "min_price": 100.0,
+    "total_amount": 1000.0,
+    "sell_percentage": 2.0,
+    "grid_levels": 10,
+}
+
+
+@pytest.fixture()
+def redis_calls(monkeypatch):
+    """Record the service's Redis side effects instead of reaching a server."""
+    calls = {"cleared": [], "notified": 0}
+
+    def delete_bot_states(self, bot_ids):
+        calls["cleared"].append(sorted(bot_ids))
+
+    def publish_symbols_changed(self):
+        calls["notified"] += 1
+
+    monkeypatch.setattr(RedisCache, "delete_bot_states", delete_bot_states)
+    monkeypatch.setattr(RedisCache, "publish_symbols_changed", publish_symbols_changed)
+    return calls
+
+
+def create_bot(client, headers, **overrides):
+    r = client.post("/trading-bots", json={**BOT, **overrides}, headers=headers)
+    assert r.status_code == 200
+    return r.json()["id"]
+
+
+def test_reactivate_only_own_inactive_bots(client, db_session, redis_calls):
+    headers = verified_user_headers(client, db_session, "owner@test.com")
+    stopped = create_bot(client, headers)
+    running = create_bot(client, headers, symbol="ETHUSDC")
+    assert client.post(f"/trading-bots/{stopped}/deactivate", headers=headers).status_code == 200
+
+    other = User(email="other@test.com", password_hash="x", role="user", is_verified=1)
+    db_session.add(other)
+    db_session.commit()
+    repo = TradingBotRepository(db_session)
+    foreign = repo.create(other.id, "BTCUSDC", 200.0, 100.0, 1000.0, 2.0).id
+    repo.deactivate(other.id, foreign)
+    redis_calls["cleared"].clear()
+    redis_calls["notified"] = 0
+
+    r = client.post(
+        "/trading-bots/reactivate",
+        json={"bot_ids": [stopped, running, foreign, 999999]},
+        headers=headers,
+    )
+
+    assert r.status_code == 200
+    assert r.json() == {"reactivated": [stopped]}
+    assert db_session.get(TradingBot, stopped).is_active == 1
+    assert db_session.get(TradingBot, foreign).is_active == 0
+    # The restarted bot rebuilds its state from trades; the WebSocket worker reloads symbols
+    assert redis_calls["cleared"] == [[stopped]]
+    assert redis_calls["notified"] == 1
+
+
+def test_reactivate_nothing_inactive_skips_redis(client, db_session, redis_calls):
+    headers = verified_user_headers(client, db_session, "owner@test.com")
+    running = create_bot(client, headers)
+    redis_calls["notified"] = 0
+
+    r = client.post("/trading-bots/reactivate", json={"bot_ids": [running]}, headers=headers)
+
+    assert r.status_code == 200
+    assert r.json() == {"reactivated": []}
+    assert redis_calls["cleared"] == []
+    assert redis_calls["notified"] == 0
+
+
+def test_reactivate_requires_bot_ids(client, db_session, redis_calls):
+    headers = verified_user_headers(client, db_session, "owner@test.com")
+
+    r = client.post("/trading-bots/reactivate", json={"bot_ids": []}, headers=headers)
+
+    assert r.status_code == 422
+
+
+def test_emergency_sell_signs_with_decrypted_keys(client, db_session, redis_calls, monkeypatch):
+    headers = verified_user_headers(client, db_session, "owner@test.com")
+    user = db_session.query(User).filter(User.email == "owner@test.com").first()
+    user.binance_api_key = encrypt("plain-key")
+    user.binance_api_secret = encrypt("plain-secret")
+    db_session.commit()
+    bot_id = create_bot(client, headers)
+    TradeRepository(db_session).create(bot_id, "buy", 150.0, 0.5)
+
+    orders = []
+    monkeypatch.setattr(trade_module, "_trade_services", OrderedDict())
+    monkeypatch.setattr(settings, "BINANCE_LIVE_TRADING", True)
+    monkeypatch.setattr(RedisCache, "get_price", lambda self, symbol: 160.0)
+    monkeypatch.setattr(RedisCache, "delete_bot_state", lambda self, bot_id: None)
+    monkeypatch.setattr(
+        BinanceTradeService, "place_order",
+        lambda self, symbol, side, quantity: orders.append((self.api_key, self.api_secret, symbol, side, quantity)),
+    )
+
+    r = client.post(f"/trading-bots/{bot_id}/emergency-sell", headers=headers)
+
+    assert r.status_code == 200
+    assert orders == [("plain-key", "plain-secret", "SOLUSDC", "SELL", 0.5)]
+
+
+def test_delete_removes_bot_and_its_trades(client, db_session, redis_calls):
+    headers = verified_user_headers(client, db_session, "owner@test.com")
+    bot_id = create_bot(client, headers)
+    kept_id = create_bot(client, headers, symbol="ETHUSDC")
+    trades = TradeRepository(db_session)
+    trades.create(bot_id, "buy", 150.0, 0.5)
+    trades.create(bot_id, "sell", 155.0, 0.5)
+    trades.create(kept_id, "buy", 150.0, 0.5)
+    redis_calls["notified"] = 0
+
+    r = client.delete(f"/trading-bots/{bot_id}", headers=headers)
+
+    assert r.status_code == 200
+    assert r.json() == {"deleted": True}
+    assert db_session.get(TradingBot, bot_id) is None
+    assert trades.list_by_bot(bot_id) == []
+    assert len(trades.list_by_bot(kept_id)) == 1
+    assert redis_calls["cleared"] == [[bot_id]]
+    assert redis_calls["notified"] == 1
+
+
+def test_delete_other_users_bot_is_not_found(client, db_session, redis_calls):
+    owner = verified_user_headers(client, db_session, "owner@test.com")
+    bot_id = create_bot(client, owner)
+    TradeRepository(db_session).create(bot_id, "buy", 150.0, 0.5)
+    intruder = verified_user_headers(client, db_session, "intruder@test.com")
+
+    r = client.delete(f"/trading-bots/{bot_id}", headers=intruder)
+
+    assert r.status_code == 404
+    assert db_session.get(TradingBot, bot_id) is not None
+    assert len(TradeRepository(db_session).list_by_bot(bot_id)) == 1
+    assert redis_calls["cleared"] == []
+
+
+def test_delete_with_trades_missing_bot_returns_false(db_session):
+    user = User(email="repo@test.com", password_hash="x", role="user", is_verified=1)
+    db_session.add(user)
+    db_session.commit()
+
+    assert TradingBotRepository(db_session).delete_with_trades(user.id, 999999) is False
@@ -11,7 +11,7 @@ os.environ["JWT_SECRET"] = os.environ.get("JWT_SECRET", "test_secret_change_me")
 
 import pytest
 from types import SimpleNamespace
-from app.services.trading_strategy import decide_trade, compute_grid, reconstruct_state_from_trades
+from app.services.trading_strategy import BotParams, decide_trade, compute_grid, reconstruct_state_from_trades
 
 
 def make_bot(**overrides):
@@ -26,7 +26,7 @@ def make_bot(**overrides):
         "sell_percentage": 2.0,    # sell when price rises 2% from entry
     }
     defaults.update(overrides)
-    return SimpleNamespace(**defaults)
+    return BotParams(**defaults)
 
 
 def empty_state():
@@ -40,8 +40,7 @@ def run_prices(bot, prices):
     all_decisions = []
     for price in prices:
         decisions, state = decide_trade(bot, price, state, previous_price)
-        for d in decisions:
-            all_decisions.append({**d, "price_at_tick": price})
+        all_decisions.extend(decisions)
         previous_price = price
     return all_decisions, state
 
@@ -94,8 +93,8 @@ class TestFirstBuy:
         state = empty_state()
         decisions, state = decide_trade(bot, 150.0, state, None)
         assert len(decisions) == 1
-        assert decisions[0]["side"] == "buy"
-        assert decisions[0]["entry_price"] == 150.0
+        assert decisions[0].side == "buy"
+        assert decisions[0].entry_price == 150.0
         assert len(state["positions"]) == 1
         # Grid should be computed from max_price
         assert len(state["grid_prices"]) == 9
@@ -121,7 +120,7 @@ class TestFirstBuy:
         state = empty_state()
         decisions, _ = decide_trade(bot, 100.0, state, None)
         # qty = 1000 / 10 / 100 = 1.0
-        assert decisions[0]["quantity"] == pytest.approx(1.0, rel=1e-6)
+        assert decisions[0].quantity == pytest.approx(1.0, rel=1e-6)
 
     def test_grid_computed_from_max_price(self):
         """Grid is computed from max_price=200 to min_price=100, not from first buy."""
@@ -148,9 +147,9 @@ class TestGridBuy:
             139.3,   # 139.3 < 139.4 (prev) and >= pullback -> BUY
         ]
         decisions, state = run_prices(bot, prices)
-        buys = [d for d in decisions if d["side"] == "buy"]
+        buys = [d for d in decisions if d.side == "buy"]
         assert len(buys) == 2
-        assert buys[1]["entry_price"] == 139.3
+        assert buys[1].entry_price == 139.3
         assert state["next_grid_index"] == 6
 
     def test_no_buy_without_pullback(self):
@@ -166,7 +165,7 @@ class TestGridBuy:
             137.0,
         ]
         decisions, state = run_prices(bot, prices)
-        buys = [d for d in decisions if d["side"] == "buy"]
+        buys = [d for d in decisions if d.side == "buy"]
         assert len(buys) == 1  # only first buy
 
     def test_no_buy_above_grid_level(self):
@@ -174,7 +173,7 @@ class TestGridBuy:
         bot = make_bot(min_price=100.0, grid_levels=10)
         prices = [150.0, 148.0, 147.0, 146.0, 147.0, 146.5]
         decisions, state = run_prices(bot, prices)
-        buys = [d for d in decisions if d["side"] == "buy"]
+        buys = [d for d in decisions if d.side == "buy"]
         assert len(buys) == 1  # only first buy
 
     def test_multiple_grid_buys(self):
@@ -194,7 +193,7 @@ class TestGridBuy:
             119.3,   # BUY at grid level 3 (120)
         ]
         decisions, state = run_prices(bot, prices)
-        buys = [d for d in decisions if d["side"] == "buy"]
+        buys = [d for d in decisions if d.side == "buy"]
         assert len(buys) == 3
         assert state["next_grid_index"] == 4
 
@@ -211,7 +210,7 @@ class TestGridBuy:
             135.3,   # BUY (price 135.3 < max_price 145)
         ]
         decisions, state = run_prices(bot, prices)
-        buys = [d for d in decisions if d["side"] == "buy"]
+        buys = [d for d in decisions if d.side == "buy"]
         assert len(buys) == 2
 
 
@@ -228,16 +227,16 @@ class TestSell:
             102.0,   # pullback: 102.0 <= 102.5 * (1 - 0.002) = 102.295 -> SELL
         ]
         decisions, state = run_prices(bot, prices)
-        sells = [d for d in decisions if d["side"] == "sell"]
+        sells = [d for d in decisions if d.side == "sell"]
         assert len(sells) == 1
-        assert sells[0]["entry_price"] == 102.0
+        assert sells[0].entry_price == 102.0
 
     def test_no_sell_without_pullback(self):
         """Price keeps rising without pullback, no sell triggered."""
         bot = make_bot(sell_percentage=2.0)
         prices = [100.0, 101.0, 102.0, 102.5, 103.0, 103.5]
         decisions, state = run_prices(bot, prices)
-        sells = [d for d in decisions if d["side"] == "sell"]
+        sells = [d for d in decisions if d.side == "sell"]
         assert len(sells) == 0
 
     def test_no_sell_without_sufficient_gain(self):
@@ -245,7 +244,7 @@ class TestSell:
         bot = make_bot(sell_percentage=2.0)
         prices = [100.0, 101.0, 100.8]  # 1% gain, then pullback
         decisions, state = run_prices(bot, prices)
-        sells = [d for d in decisions if d["side"] == "sell"]
+        sells = [d for d in decisions if d.side == "sell"]
         assert len(sells) == 0
 
 
@@ -262,8 +261,8 @@ class TestCycleRestart:
             101.0,   # no positions, price <= max_price -> new buy (restart)
         ]
         decisions, state = run_prices(bot, prices)
-        buys = [d for d in decisions if d["side"] == "buy"]
-        sells = [d for d in decisions if d["side"] == "sell"]
+        buys = [d for d in decisions if d.side == "buy"]
+        sells = [d for d in decisions if d.side == "sell"]
         assert len(buys) == 2  # first buy + restart buy
         assert len(sells) == 1
         # New grid should be computed from the restart price
@@ -279,7 +278,7 @@ class TestCycleRestart:
             101.0,   # no positions, but price > max_price -> no buy
         ]
         decisions, state = run_prices(bot, prices)
-        buys = [d for d in decisions if d["side"] == "buy"]
+        buys = [d for d in decisions if d.side == "buy"]
         assert len(buys) == 1  # only first buy, no restart
 
     def test_grid_always_from_max_price(self):
@@ -316,8 +315,8 @@ class TestMultiplePositions:
             153.0,   # pullback -> SELL pos1
         ]
         decisions, state = run_prices(bot, prices)
-        buys = [d for d in decisions if d["side"] == "buy"]
-        sells = [d for d in decisions if d["side"] == "sell"]
+        buys = [d for d in decisions if d.side == "buy"]
+        sells = [d for d in decisions if d.side == "sell"]
         assert len(buys) == 2
         assert len(sells) == 2
         assert len(state["positions"]) == 0
@@ -361,6 +360,42 @@ class TestMultiplePositions:
         _, state = decide_trade(bot, 147.0, state, 148.0)
         assert state["lowest_price"] == 147.0
 
+    def test_min_entry_tracks_cheapest_open_position(self):
+        """min_entry follows buys and sells, and is cleared when all positions close."""
+        bot = make_bot(max_price=200.0, min_price=100.0, grid_levels=10)
+        state = empty_state()
+
+        _, state = decide_trade(bot, 150.0, state, None)
+        assert state["min_entry"] == 150.0
+
+        # Grid buy at 139.3 lowers it
+        _, state = decide_trade(bot, 139.0, state, 150.0)
+        _, state = decide_trade(bot, 139.5, state, 139.0)
+        _, state = decide_trade(bot, 139.3, state, 139.5)
+        assert state["min_entry"] == 139.3
+
+        # Pos2 sells on the way up, pos1 remains
+        _, state = decide_trade(bot, 142.5, state, 139.3)
+        decisions, state = decide_trade(bot, 142.2, state, 142.5)
+        assert [d.side for d in decisions] == ["sell"]
+        assert state["min_entry"] == 150.0
+
+        _, state = decide_trade(bot, 153.5, state, 142.2)
+        decisions, state = decide_trade(bot, 153.1, state, 153.5)
+        assert [d.side for d in decisions] == ["sell"]
+        assert state["min_entry"] is None
+
+    def test_state_without_min_entry_still_sells(self):
+        """States persisted before min_entry existed fall back to the positions."""
+        bot = make_bot()
+        state = empty_state()
+        _, state = decide_trade(bot, 100.0, state, None)
+        del state["min_entry"]
+
+        _, state = decide_trade(bot, 102.5, state, 100.0)
+        decisions, state = decide_trade(bot, 102.0, state, 102.5)
+        assert [d.side for d in decisions] == ["sell"]
+
 
 class TestReconstructState:
     """Tests for reconstruct_state_from_trades."""
@@ -470,8 +505,8 @@ class TestFullScenario:
             154.5,   # pullback -> SELL pos1
         ]
         decisions, state = run_prices(bot, prices)
-        buys = [d for d in decisions if d["side"] == "buy"]
-        sells = [d for d in decisions if d["side"] == "sell"]
+        buys = [d for d in decisions if d.side == "buy"]
+        sells = [d for d in decisions if d.side == "sell"]
 
         assert len(buys) == 3
         assert len(sells) == 3
@@ -482,7 +517,7 @@ class TestFullScenario:
         bot = make_bot()
         prices = [150.0] * 20
         decisions, state = run_prices(bot, prices)
-        buys = [d for d in decisions if d["side"] == "buy"]
+        buys = [d for d in decisions if d.side == "buy"]
         assert len(buys) == 1  # only initial buy
         assert len(state["positions"]) == 1
 
@@ -498,8 +533,8 @@ class TestFullScenario:
             145.0,   # restart buy
         ]
         decisions, state = run_prices(bot, prices)
-        buys = [d for d in decisions if d["side"] == "buy"]
-        sells = [d for d in decisions if d["side"] == "sell"]
+        buys = [d for d in decisions if d.side == "buy"]
+        sells = [d for d in decisions if d.side == "sell"]
         assert len(buys) == 2  # first + restart
         assert len(sells) == 1
         assert state["grid_prices"] == []  # no grid with 1 level
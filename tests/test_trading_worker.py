@@ -0,0 +1,168 @@
+import pytest
+from redis import RedisError
+
+from app.models.trade import Trade
+from app.models.user import User
+from app.repositories.trade_repo import TradeRepository
+from app.repositories.trading_bot_repo import TradingBotRepository
+import app.workers.tasks as tasks
+
+
+class FakeCache:
+    """In-memory stand-in for RedisCache with just what tick_all_bots uses."""
+
+    def __init__(self, prices=None, states=None, lock_free=True):
+        self.prices = prices or {}
+        self.states = dict(states or {})
+        self.lock_free = lock_free
+        self.state_writes = []  # one dict per set_bot_states_batch call
+        self.released = []
+        self.release_error = False
+
+    def acquire_lock(self, name, ttl):
+        return "token-1" if self.lock_free else None
+
+    def release_lock(self, name, token):
+        if self.release_error:
+            raise RedisError("connection lost")
+        self.released.append(token)
+
+    def get_prices_batch(self, symbols):
+        return {s.upper(): self.prices[s.upper()] for s in symbols if s.upper() in self.prices}
+
+    def get_bot_states_batch(self, bot_ids):
+        return {bot_id: self.states[bot_id] for bot_id in bot_ids if bot_id in self.states}
+
+    def set_bot_states_batch(self, states):
+        self.state_writes.append(states)
+        self.states.update(states)
+
+
+@pytest.fixture()
+def worker(db_session, monkeypatch):
+    """Point tick_all_bots at the test session; returns a setter for the fake cache."""
+    monkeypatch.setattr(tasks, "SessionLocal", lambda: db_session)
+
+    def use_cache(cache):
+        monkeypatch.setattr(tasks, "RedisCache", lambda: cache)
+        return cache
+
+    return use_cache
+
+
+def make_user(db_session, email="worker@test.com"):
+    user = User(email=email, password_hash="x", role="user", is_verified=1)
+    db_session.add(user)
+    db_session.commit()
+    return user
+
+
+def make_bot(db_session, user, symbol="SOLUSDC"):
+    return TradingBotRepository(db_session).create(
+        user_id=user.id, symbol=symbol, max_price=200.0, min_price=100.0,
+        total_amount=1000.0, sell_percentage=2.0, grid_levels=10,
+    )
+
+
+def trades_of(db_session, bot_id):
+    return TradeRepository(db_session).list_by_bot_chronological(bot_id)
+
+
+def test_skips_tick_when_lock_held(db_session, worker):
+    bot_id = make_bot(db_session, make_user(db_session)).id
+    cache = worker(FakeCache(prices={"SOLUSDC": 150.0}, lock_free=False))
+
+    tasks.tick_all_bots()
+
+    assert trades_of(db_session, bot_id) == []
+    assert cache.state_writes == []
+    assert cache.released == []
+
+
+def test_missing_price_skips_only_that_bot(db_session, worker):
+    user = make_user(db_session)
+    priced_id = make_bot(db_session, user, "SOLUSDC").id
+    unpriced_id = make_bot(db_session, user, "ETHUSDC").id
+    cache = worker(FakeCache(prices={"SOLUSDC": 150.0}))
+
+    tasks.tick_all_bots()
+
+    assert [t.trade_type for t in trades_of(db_session, priced_id)] == ["buy"]
+    assert trades_of(db_session, unpriced_id) == []
+    assert set(cache.states) == {priced_id}
+    assert cache.states[priced_id]["previous_price"] == 150.0
+    assert cache.released == ["token-1"]
+
+
+def test_unchanged_state_is_not_rewritten(db_session, worker):
+    bot_id = make_bot(db_session, make_user(db_session)).id
+    # Above max_price: no trade, so the second tick leaves the state as it was
+    cache = worker(FakeCache(prices={"SOLUSDC": 250.0}))
+
+    tasks.tick_all_bots()
+    tasks.tick_all_bots()
+
+    assert list(cache.state_writes[0]) == [bot_id]
+    assert cache.state_writes[1] == {}
+
+
+def test_trade_insert_failure_leaves_states_untouched(db_session, worker, monkeypatch):
+    make_bot(db_session, make_user(db_session))
+    cache = worker(FakeCache(prices={"SOLUSDC": 150.0}))
+
+    def fail_insert(self, rows):
+        raise RuntimeError("insert failed")
+
+    monkeypatch.setattr(TradeRepository, "create_many", fail_insert)
+
+    tasks.tick_all_bots()
+
+    assert cache.state_writes == []
+    assert cache.states == {}
+    assert cache.released == ["token-1"]
+
+
+def test_recovers_state_from_trades_when_redis_has_none(db_session, worker):
+    bot_id = make_bot(db_session, make_user(db_session)).id
+    TradeRepository(db_session).create(bot_id, "buy", 150.0, 0.667)
+    # Above the next grid level (140): the recovered position is kept, no new trade
+    cache = worker(FakeCache(prices={"SOLUSDC": 149.0}))
+
+    tasks.tick_all_bots()
+
+    state = cache.states[bot_id]
+    assert [p["entry"] for p in state["positions"]] == [150.0]
+    assert state["next_grid_index"] == 5
+    assert len(trades_of(db_session, bot_id)) == 1
+
+
+def test_failed_bot_query_does_not_lose_other_trades(db_session, worker, monkeypatch):
+    user = make_user(db_session)
+    broken_id = make_bot(db_session, user, "ETHUSDC").id
+    healthy_id = make_bot(db_session, user, "SOLUSDC").id
+    worker(FakeCache(prices={"SOLUSDC": 150.0, "ETHUSDC": 150.0}))
+    recover_state = tasks._recover_state
+
+    def recover_or_fail(db, bot):
+        if bot.id == broken_id:
+            # A failed flush leaves the session needing a rollback
+            db.add(Trade(trading_bot_id=bot.id, trade_type=None, price=1.0, quantity=1.0))
+            db.flush()
+        return recover_state(db, bot)
+
+    monkeypatch.setattr(tasks, "_recover_state", recover_or_fail)
+
+    tasks.tick_all_bots()
+
+    assert [t.trade_type for t in trades_of(db_session, healthy_id)] == ["buy"]
+    assert trades_of(db_session, broken_id) == []
+
+
+def test_lock_release_error_does_not_raise(db_session, worker):
+    make_bot(db_session, make_user(db_session))
+    cache = worker(FakeCache(prices={"SOLUSDC": 150.0}))
+    cache.release_error = True
+
+    tasks.tick_all_bots()
+
+    assert len(cache.state_writes) == 1